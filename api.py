@@ -18,6 +18,7 @@ import re
 import math
 import json
 import hashlib
+import threading
 import numpy as np
 from pathlib import Path
 from datetime import datetime
@@ -38,6 +39,7 @@ sys.path.insert(0, str(APP_DIR))
 sys.path.insert(0, str(APP_DIR / 'app'))
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -48,7 +50,7 @@ from typing import Optional, List
 from auth_manager import register_user, authenticate_user, init_auth_tables
 from contract_manager import ContractManager
 from contract_logger import ContractLogger
-from cache_manager import SemanticCache
+from cache_manager import SemanticCache, RetrievalCache
 from nac_contract_data import *
 
 # ─── API Clients ───
@@ -64,6 +66,7 @@ anthropic_client: Anthropic = None
 contract_manager: ContractManager = None
 logger: ContractLogger = None
 semantic_cache: SemanticCache = None
+retrieval_cache: RetrievalCache = None
 
 # BM25 index cache (replaces @st.cache_data)
 _bm25_cache = {}
@@ -71,7 +74,7 @@ _bm25_cache = {}
 
 def init_globals():
     """Initialize all shared resources."""
-    global openai_client, anthropic_client, contract_manager, logger, semantic_cache
+    global openai_client, anthropic_client, contract_manager, logger, semantic_cache, retrieval_cache
 
     openai_key = os.environ.get("OPENAI_API_KEY", "")
     anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -84,6 +87,7 @@ def init_globals():
     contract_manager = ContractManager()
     logger = ContractLogger()
     semantic_cache = SemanticCache()
+    retrieval_cache = RetrievalCache()
 
     init_auth_tables()
     print("[API] ✅ All systems initialized")
@@ -230,9 +234,10 @@ async def search(req: SearchRequest):
     if req.conversation_history:
         conv_history = [{"question": e.question, "answer": e.answer} for e in req.conversation_history]
 
-    # Run the full search pipeline
-    answer, status, response_time, cached, model_tier = full_search_pipeline(
-        req.query, chunks, embeddings, cid, airline_name, conv_history
+    # Run the full search pipeline off the event loop so concurrent
+    # requests overlap (and their question embeddings can be batched)
+    answer, status, response_time, cached, model_tier = await run_in_threadpool(
+        full_search_pipeline, req.query, chunks, embeddings, cid, airline_name, conv_history
     )
 
     # Log the question
@@ -274,12 +279,16 @@ async def feedback(req: FeedbackRequest):
         logger.log_rating(req.question, req.rating, cid, req.comment or "")
         if req.rating == "down":
             try:
-                semantic_cache.record_thumbs_down(req.question, cid)
+                # Embedding and cache writes block on network calls — keep them off the event loop
+                question_embedding = await run_in_threadpool(
+                    get_embedding, preprocess_question(req.question.strip()).lower()
+                )
+                await run_in_threadpool(semantic_cache.record_thumbs_down, req.question, cid, question_embedding)
             except Exception:
                 pass
             if req.comment:
                 try:
-                    semantic_cache.save_feedback(req.question, cid, req.comment)
+                    await run_in_threadpool(semantic_cache.save_feedback, req.question, cid, req.comment)
                 except Exception:
                     pass
         return {"success": True}
@@ -323,7 +332,7 @@ if (PWA_DIR / "icons").exists():
 
 
 # ── Question Categories (keyword matching, no AI) ──
-QUESTION_CATEGORIES = {
+QUESTION_CATEGORIES = {sys.intern(k): v for k, v in {
     "Pay → Hourly Rate": ['hourly rate', 'pay rate', 'what do i make', 'how much do i make', 'rate of pay', 'longevity rate', 'current rate'],
     "Pay → Daily Pay Guarantee": ['dpg', 'daily pay guarantee', 'minimum pay per day', 'daily guarantee'],
     "Pay → Duty Rig": ['duty rig', 'duty day pay', '1:2'],
@@ -351,7 +360,7 @@ QUESTION_CATEGORIES = {
     "Sick Leave": ['sick', 'sick call', 'sick leave', 'calling in sick', 'illness', 'sick pay', 'sick bank'],
     "Deadhead": ['deadhead', 'deadhead pay', 'deadhead rest', 'positioning', 'repositioning'],
     "Hours of Service": ['hours of service', 'flight time limit', 'block limit', 'rest interruption', 'rest interrupted'],
-}
+}.items()}
 
 
 def classify_question(question_text):
@@ -404,8 +413,7 @@ def preprocess_question(question_text):
 
 
 # ── Cosine Similarity ──
-def cosine_similarity(a, b):
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+# cosine_similarities → loaded from nac_contract_data.py
 
 
 # ── BM25 Keyword Search ──
@@ -479,36 +487,90 @@ def _bm25_search(query, chunks, top_n=15, k1=1.5, b=0.75):
 _embedding_cache = {}
 
 
+class _EmbeddingSlot:
+    __slots__ = ('text', 'value', 'error', 'done')
+
+    def __init__(self, text):
+        self.text = text
+        self.value = None
+        self.error = None
+        self.done = False
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into one OpenAI call.
+
+    No timer: a caller that finds nothing in flight sends straight away.
+    Callers arriving while a request is in flight queue up, and the first
+    of them sends the whole queue as the next batch once it returns.
+    """
+    MAX_BATCH = 64
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = []
+        self._busy = False
+
+    def embed(self, text):
+        slot = _EmbeddingSlot(text)
+        with self._cond:
+            self._pending.append(slot)
+            while not slot.done:
+                if self._busy:
+                    self._cond.wait()
+                    continue
+                self._busy = True
+                batch = self._pending[:self.MAX_BATCH]
+                del self._pending[:self.MAX_BATCH]
+                self._cond.release()
+                try:
+                    self._send(batch)
+                finally:
+                    self._cond.acquire()
+                    self._busy = False
+                    self._cond.notify_all()
+        if slot.error is not None:
+            raise slot.error
+        return slot.value
+
+    @staticmethod
+    def _send(batch):
+        try:
+            response = openai_client.embeddings.create(
+                input=[s.text for s in batch], model="text-embedding-3-small"
+            )
+            for s, item in zip(batch, sorted(response.data, key=lambda d: d.index)):
+                s.value = item.embedding
+            if len(batch) > 1:
+                print(f"[API] Embedded {len(batch)} questions in one request")
+        except Exception as e:
+            for s in batch:
+                s.error = e
+        finally:
+            for s in batch:
+                s.done = True
+
+
+_embedding_batcher = _EmbeddingBatcher()
+
+
 def get_embedding(text):
     if text in _embedding_cache:
         return _embedding_cache[text]
-    response = openai_client.embeddings.create(input=text, model="text-embedding-3-small")
-    emb = response.data[0].embedding
+    emb = _embedding_batcher.embed(text)
     _embedding_cache[text] = emb
     return emb
 
 
 # ── Force Include Chunks ──
-def find_force_include_chunks(question_lower, all_chunks):
-    forced = []
-    for rule_name, rule in FORCE_INCLUDE_RULES.items():
-        if any(kw in question_lower for kw in rule['trigger_keywords']):
-            for chunk in all_chunks:
-                chunk_text_lower = ' '.join(chunk['text'].lower().split())
-                for phrase in rule['must_include_phrases']:
-                    if phrase in chunk_text_lower:
-                        if chunk not in forced:
-                            forced.append(chunk)
-                        break
-    return forced
+# find_force_include_chunks → loaded from nac_contract_data.py
 
 
 # ── Context Packs ──
 def get_pack_chunks(pack_key, all_chunks):
     if pack_key not in CONTEXT_PACKS:
         return []
-    pages = set(CONTEXT_PACKS[pack_key]['pages'])
-    return [c for c in all_chunks if c['page'] in pages]
+    return chunks_on_pages(all_chunks, CONTEXT_PACKS[pack_key]['pages'])
 
 
 def classify_all_matching_packs(question_text):
@@ -528,18 +590,22 @@ def classify_all_matching_packs(question_text):
 def search_contract(question, chunks, embeddings, max_chunks=75):
     question_embedding = get_embedding(question)
     question_lower = question.lower()
-    forced_chunks = find_force_include_chunks(question_lower, chunks)
+    matched_keywords = keyword_signature(question_lower)  # one keyword pass, shared below
+    forced_chunks = find_force_include_chunks(question_lower, chunks, matched_keywords)
 
-    matching_packs = classify_all_matching_packs(question)
+    matching_packs = classify_all_matching_packs(question_lower)
+
+    signature = (max_chunks, tuple(matching_packs), matched_keywords, tuple(sorted(_bm25_tokenize(question))))
+    cached = retrieval_cache.lookup(question_embedding, chunks, signature)
+    if cached is not None:
+        return cached
+
+    similarities = cosine_similarities(question_embedding, embeddings)
 
     if matching_packs:
-        merged_pages = set()
-        for pk in matching_packs:
-            merged_pages.update(CONTEXT_PACKS[pk]['pages'])
-        for keyword, chain_pages in PROVISION_CHAINS.items():
-            if keyword in question_lower:
-                merged_pages.update(chain_pages)
-        pack_chunks = [c for c in chunks if c['page'] in merged_pages]
+        merged_pages = set().union(*(CONTEXT_PACKS[pk]['pages'] for pk in matching_packs))
+        merged_pages.update(provision_chain_pages(question_lower, matched_keywords)[0])
+        pack_chunks = chunks_on_pages(chunks, merged_pages)
         if len(matching_packs) > 1:
             max_total = 35
             embedding_top_n = 10
@@ -552,26 +618,19 @@ def search_contract(question, chunks, embeddings, max_chunks=75):
             pack_scores = []
             for pc in pack_chunks:
                 idx = id_to_idx.get(pc.get('id'))
-                score = cosine_similarity(question_embedding, embeddings[idx]) if idx is not None else 0
+                score = similarities[idx] if idx is not None else 0
                 pack_scores.append((score, pc))
             pack_scores.sort(reverse=True, key=lambda x: x[0])
             pack_chunks = [pc for _, pc in pack_scores[:max_pack]]
     else:
-        chain_pages = set()
-        for keyword, pages in PROVISION_CHAINS.items():
-            if keyword in question_lower:
-                chain_pages.update(pages)
-        pack_chunks = [c for c in chunks if c['page'] in chain_pages] if chain_pages else []
+        chain_pages = provision_chain_pages(question_lower, matched_keywords)[0]
+        pack_chunks = chunks_on_pages(chunks, chain_pages) if chain_pages else []
         embedding_top_n = 30
         max_total = 30
 
-    # Embedding search
-    similarities = []
-    for i, chunk_embedding in enumerate(embeddings):
-        score = cosine_similarity(question_embedding, chunk_embedding)
-        similarities.append((score, chunks[i]))
-    similarities.sort(reverse=True, key=lambda x: x[0])
-    embedding_chunks = [chunk for score, chunk in similarities[:embedding_top_n]]
+    # Embedding search — stable sort keeps chunk order on ties
+    top = np.argsort(-similarities, kind='stable')[:embedding_top_n]
+    embedding_chunks = [chunks[i] for i in top]
 
     # BM25
     bm25_top_n = min(10, embedding_top_n)
@@ -592,6 +651,7 @@ def search_contract(question, chunks, embeddings, max_chunks=75):
         if len(merged) >= max_total:
             break
 
+    retrieval_cache.store(question_embedding, chunks, signature, merged)
     return merged
 
 
@@ -647,15 +707,14 @@ def _build_pay_reference(question):
     for pos in positions:
         for y in years_to_show:
             dos = PAY_RATES_DOS['B737'][pos][y]
-            current = round(dos * PAY_MULTIPLIER, 2)
+            current = PAY_RATES_CURRENT['B737'][pos][y]
             lines.append(f"B737 {pos} Year {y}: DOS {dos:.2f} → Current {current:.2f}/hour")
 
     if has_scenario and year:
         lines.append("")
         lines.append("PAY CALCULATIONS FOR THIS SCENARIO:")
         for pos in positions:
-            dos = PAY_RATES_DOS['B737'][pos][year]
-            rate = round(dos * PAY_MULTIPLIER, 2)
+            rate = PAY_RATES_CURRENT['B737'][pos][year]
             lines.append(f"  {pos} Year {year} rate: {rate:.2f}/hour")
             calcs = []
             if block_hours is not None:
@@ -802,24 +861,32 @@ def _classify_complexity(question_lower, matching_packs=None, has_pay_ref=False,
 
 
 # ── Tier 1 Instant Answers ──
+# Definition questions: the captured term is looked up in DEFINITIONS_LOOKUP
+_DEF_PATTERNS = [
+    r'what (?:does|is|are|do)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:mean|stand for|definition)',
+    r'define\s+["\']?(.+?)["\']?\s*$',
+    r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*\??\s*$',
+]
+_DEF_COMPILED = [re.compile(p) for p in _DEF_PATTERNS]
+_DEF_TRAILING_RE = re.compile(r'\s+(mean|means|stand|stands|defined|definition).*$')
+# Pay-rate questions: "year 5" / "5-year"
+_YEAR_AFTER_RE = re.compile(r'year\s*(\d{1,2})')
+_YEAR_BEFORE_RE = re.compile(r'(\d{1,2})[\s-]*year')
+
 def tier1_instant_answer(question_lower):
     """Check for instant answers (no API call). Returns (answer, status, time) or None."""
     start = time.time()
 
     # Fixed-value rule lookups
-    for rule_key, rule in TIER1_RULES.items():
-        if any(kw in question_lower for kw in rule['keywords']):
-            has_numeric = re.search(r'\d+(?:\.\d+)?\s*hours?\s*(?:of\s+)?(?:duty|rest|block|on duty)', question_lower)
-            if not has_numeric:
-                return rule['answer'], 'CLEAR', round(time.time() - start, 1)
+    answer = match_tier1_answer(question_lower)
+    if answer:
+        has_numeric = TIER1_NUMERIC_SCENARIO_RE.search(question_lower)
+        if not has_numeric:
+            return answer, 'CLEAR', round(time.time() - start, 1)
 
     # Per diem (dynamic based on date)
-    if any(kw in question_lower for kw in PER_DIEM_KEYWORDS):
-        now = datetime.now()
-        anniversaries = now.year - DOS_DATE.year
-        if (now.month, now.day) < (DOS_DATE.month, DOS_DATE.day):
-            anniversaries -= 1
-        anniversaries = max(0, anniversaries)
+    if any(kw in question_lower for kw in PER_DIEM_MATCH_TERMS):
+        anniversaries = get_pay_rates()[0]
         current_domestic = PER_DIEM_BASE_DOMESTIC + anniversaries
         current_international = PER_DIEM_BASE_INTERNATIONAL + anniversaries
         answer = f"""📄 CONTRACT LANGUAGE: "For Duty or other Company-Directed Assignments that are performed within the Contiguous United States, including all time during a layover in the United States, Fifty-Six Dollars ($56) per Day." 📍 Section 6.C.2.a, Page 99
@@ -847,7 +914,7 @@ def tier1_instant_answer(question_lower):
     pay_keywords = ['pay rate', 'hourly rate', 'make per hour', 'paid per hour',
                     'how much', 'what rate', 'pay scale']
     if any(kw in question_lower for kw in pay_keywords):
-        year_match = re.search(r'year\s*(\d{1,2})', question_lower) or re.search(r'(\d{1,2})[\s-]*year', question_lower)
+        year_match = _YEAR_AFTER_RE.search(question_lower) or _YEAR_BEFORE_RE.search(question_lower)
         if year_match:
             year = int(year_match.group(1))
             if 1 <= year <= 12:
@@ -861,7 +928,7 @@ def tier1_instant_answer(question_lower):
                 rate_lines = []
                 for ac, pos in combos:
                     dos_rate = PAY_RATES_DOS[ac][pos][year]
-                    current_rate = round(dos_rate * PAY_MULTIPLIER, 2)
+                    current_rate = PAY_RATES_CURRENT[ac][pos][year]
                     rate_lines.append(f'- {pos} Year {year}: DOS rate {dos_rate:.2f} x 1.02^{PAY_INCREASES} = {current_rate:.2f} per hour')
                 answer = f"""📄 CONTRACT LANGUAGE: "B737 pay rates" 📍 Appendix A, Page 66
 
@@ -877,16 +944,12 @@ def tier1_instant_answer(question_lower):
                 return answer, 'CLEAR', round(time.time() - start, 1)
 
     # Definition lookups
-    def_patterns = [
-        r'what (?:does|is|are|do)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:mean|stand for|definition)',
-        r'define\s+["\']?(.+?)["\']?\s*$',
-        r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*\??\s*$',
-    ]
-    for pattern in def_patterns:
-        match = re.search(pattern, question_lower.strip().rstrip('?'))
+    question_stripped = question_lower.strip().rstrip('?')
+    for pattern in _DEF_COMPILED:
+        match = pattern.search(question_stripped)
         if match:
             term = match.group(1).strip().lower()
-            term = re.sub(r'\s+(mean|means|stand|stands|defined|definition).*$', '', term)
+            term = _DEF_TRAILING_RE.sub('', term)
             if term in DEFINITIONS_LOOKUP:
                 display_term = term.upper() if len(term) <= 4 else term.title()
                 answer = f"""📄 CONTRACT LANGUAGE: "{display_term}: {DEFINITIONS_LOOKUP[term]}" 📍 Section 2, Pages 13-45
@@ -1060,12 +1123,14 @@ Every claim must trace to a specific quoted provision. Do not speculate about "c
 Do NOT use dollar signs ($) — write amounts without them."""
         max_tokens = 2000 if model_tier == 'complex' else 1500
 
-    user_content = f"CONTRACT SECTIONS:\n{context}\n\nQUESTION: {question}\n"
+    # One join — each += would copy the (large) context block again
+    user_parts = [f"CONTRACT SECTIONS:\n{context}\n\nQUESTION: {question}\n"]
     if pay_ref:
-        user_content += f"\n{pay_ref}\n"
+        user_parts.append(f"\n{pay_ref}\n")
     if grievance_ref:
-        user_content += f"\n{grievance_ref}\n"
-    user_content += "\nAnswer:"
+        user_parts.append(f"\n{grievance_ref}\n")
+    user_parts.append("\nAnswer:")
+    user_content = ''.join(user_parts)
 
     messages = []
 
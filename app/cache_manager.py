@@ -10,8 +10,197 @@ import streamlit as st
 import threading
 import json
 import os
+import urllib.request
+from collections import Counter
 import numpy as np
 
+# pybase64 (SIMD) is a drop-in for the stdlib codec; fall back when absent
+try:
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+
+# orjson parses/serializes Turso payloads several times faster than json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# Embeddings are stored as raw float32 (they barely compress). Rows that were
+# written zstd-compressed are recognised by the frame magic number, which
+# can't begin a raw float32 embedding (it decodes to roughly -1e37), and are
+# read back when zstandard happens to be installed.
+try:
+    import zstandard
+    _zstd_decompress = zstandard.ZstdDecompressor().decompress
+except ImportError:
+    _zstd_decompress = None
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _decode_b64(text):
+    """Decode base64 that may arrive unpadded (Hrana blob values)."""
+    return _b64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _pack_embedding(embedding):
+    """Raw float32 bytes for the embedding BLOB column."""
+    return np.ascontiguousarray(embedding, dtype=np.float32).tobytes()
+
+
+def _unpack_embedding(payload):
+    """Inverse of _pack_embedding. Returns None if the payload can't be decoded here."""
+    if payload[:4] == _ZSTD_MAGIC:
+        if _zstd_decompress is None:
+            return None
+        payload = _zstd_decompress(payload)
+    return np.frombuffer(payload, dtype=np.float32)
+
+
+# ============================================================
+# SIMILARITY SEARCH
+# ============================================================
+# Each row gets a 64-bit random-projection (SimHash) signature. Lookups rank
+# rows by Hamming distance to the query signature and only compute the exact
+# cosine for the closest PRUNE_CANDIDATES rows. At the 0.93 threshold a true
+# match usually differs in ~8 of 64 bits and lands inside the candidate set;
+# when the candidates hold no match, the full matrix is checked before
+# reporting a miss, so pruning only speeds up hits and never loses one.
+SIG_BITS = 64
+PRUNE_CANDIDATES = 32
+_projections = {}
+
+
+def _projection(dim):
+    """Shared random hyperplanes for a given embedding dimension."""
+    proj = _projections.get(dim)
+    if proj is None:
+        proj = np.random.default_rng(0).standard_normal((SIG_BITS, dim)).astype(np.float32)
+        _projections[dim] = proj
+    return proj
+
+
+def _signatures(matrix):
+    """Pack the sign bits of each row's projection into one uint64 per row."""
+    bits = matrix @ _projection(matrix.shape[1]).T > 0
+    return np.packbits(bits, axis=1).view(np.uint64).ravel()
+
+
+def _normalize(embedding):
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm else embedding
+
+
+class _ContractBucket:
+    """Cached rows for one contract plus a stacked embedding matrix.
+
+    Rows are (embedding, question, answer, status, response_time, category,
+    entry_id) tuples, oldest first, with the embedding unit-normalized so
+    cosine similarity is a plain dot product. entry_id is the Turso row id,
+    or None for memory-only entries. Per-category counts are kept in step
+    with the rows so stats never need a scan.
+
+    The matrix and signatures live in over-allocated buffers: appends write
+    the next free row and evicting the oldest row just advances _start, so a
+    store() never restacks the whole bucket. Only keep() (admin deletes)
+    drops the buffers for a rebuild on the next lookup.
+    """
+    __slots__ = ('rows', 'categories', '_matrix', '_sigs', '_start')
+
+    def __init__(self):
+        self.rows = []
+        self.categories = Counter()
+        self._matrix = None
+        self._sigs = None
+        self._start = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _build(self):
+        self._matrix = np.vstack([r[0] for r in self.rows])
+        self._sigs = _signatures(self._matrix)
+        self._start = 0
+
+    def _live(self):
+        """(matrix, signatures) views over the current rows."""
+        if self._matrix is None:
+            self._build()
+        end = self._start + len(self.rows)
+        return self._matrix[self._start:end], self._sigs[self._start:end]
+
+    def append(self, row):
+        self.rows.append(row)
+        self.categories[row[5] or "Uncategorized"] += 1
+        if self._matrix is None:
+            return
+        n = len(self.rows) - 1
+        end = self._start + n
+        if end == len(self._matrix):
+            # Out of room: slide live rows to the front, doubling if already full
+            capacity = len(self._matrix) * 2 if n == len(self._matrix) else len(self._matrix)
+            matrix = np.empty((capacity, self._matrix.shape[1]), dtype=self._matrix.dtype)
+            sigs = np.empty(capacity, dtype=np.uint64)
+            matrix[:n] = self._matrix[self._start:end]
+            sigs[:n] = self._sigs[self._start:end]
+            self._matrix, self._sigs, self._start, end = matrix, sigs, 0, n
+        self._matrix[end] = row[0]
+        self._sigs[end] = _signatures(row[0][np.newaxis, :])[0]
+
+    def pop_oldest(self):
+        row = self.rows.pop(0)
+        self.categories[row[5] or "Uncategorized"] -= 1
+        if self._matrix is not None:
+            self._start += 1
+        return row
+
+    def set_id(self, row, entry_id):
+        """Attach the Turso id to a row once its INSERT has returned."""
+        for i, r in enumerate(self.rows):
+            if r is row:
+                self.rows[i] = row[:6] + (entry_id,)
+                return
+
+    def keep(self, predicate):
+        """Drop rows failing predicate; returns how many were removed."""
+        kept = []
+        for r in self.rows:
+            if predicate(r):
+                kept.append(r)
+            else:
+                self.categories[r[5] or "Uncategorized"] -= 1
+        removed = len(self.rows) - len(kept)
+        if removed:
+            self.rows = kept
+            self._matrix = None
+            self._sigs = None
+        return removed
+
+    def best_match(self, query, threshold):
+        """Return (score, index) of the most similar row above threshold, else None."""
+        if not self.rows:
+            return None
+        matrix, sigs = self._live()
+        # Scale the scores rather than the query — avoids copying the vector
+        norm = float(np.linalg.norm(query)) or 1.0
+        if len(self.rows) > PRUNE_CANDIDATES:
+            q_sig = _signatures(query[np.newaxis, :])[0]
+            dist = np.unpackbits((sigs ^ q_sig).view(np.uint8)).reshape(-1, SIG_BITS).sum(axis=1)
+            candidates = np.argpartition(dist, PRUNE_CANDIDATES)[:PRUNE_CANDIDATES]
+            scores = matrix[candidates] @ query / norm
+            best = int(np.argmax(scores))
+            if scores[best] > threshold:
+                return float(scores[best]), int(candidates[best])
+            # Pruning can miss a match; confirm a miss against every row
+        scores = matrix @ query / norm
+        index = int(np.argmax(scores))
+        score = float(scores[index])
+        return (score, index) if score > threshold else None
+
 
 class SemanticCache:
     """Turso-backed persistent cache with in-memory similarity search.
@@ -42,8 +231,6 @@ class SemanticCache:
 
     def _turso_request(self, statements):
         """Send SQL statements to Turso via HTTP API."""
-        import urllib.request
-        import base64 as b64module
         requests_body = []
         for stmt in statements:
             if isinstance(stmt, str):
@@ -52,7 +239,7 @@ class SemanticCache:
                 requests_body.append({"type": "execute", "stmt": stmt})
         requests_body.append({"type": "close"})
         
-        data = json.dumps({"requests": requests_body}).encode('utf-8')
+        data = _json_dumps({"requests": requests_body})
         req = urllib.request.Request(
             self._http_url,
             data=data,
@@ -63,7 +250,7 @@ class SemanticCache:
         )
         try:
             with urllib.request.urlopen(req, timeout=10) as resp:
-                return json.loads(resp.read().decode('utf-8'))
+                return _json_loads(resp.read())
         except urllib.request.HTTPError as e:
             error_body = e.read().decode('utf-8') if e.fp else 'no body'
             print(f"[Cache] Turso HTTP {e.code}: {error_body[:200]}")
@@ -92,6 +279,9 @@ class SemanticCache:
                 "ALTER TABLE answer_cache ADD COLUMN thumbs_down INTEGER DEFAULT 0",
                 "ALTER TABLE answer_cache ADD COLUMN serve_count INTEGER DEFAULT 0",
                 "ALTER TABLE answer_cache ADD COLUMN reviewed INTEGER DEFAULT 0",
+                # Raw float32 bytes — replaces embedding_b64 for new rows
+                "ALTER TABLE answer_cache ADD COLUMN embedding_blob BLOB",
+                "CREATE INDEX IF NOT EXISTS idx_cache_contract_question ON answer_cache(contract_id, question)",
                 # Metadata table for tracking cache-invalidation keys (e.g. PAY_INCREASES)
                 """CREATE TABLE IF NOT EXISTS cache_metadata (
                     key TEXT PRIMARY KEY,
@@ -118,14 +308,24 @@ class SemanticCache:
             print(f"[Cache] Turso init error: {e} — memory-only mode")
 
     def _load_from_turso(self):
-        """Load all cached entries from Turso into memory."""
+        """Load the newest MAX_ENTRIES cached entries per contract from Turso into memory.
+
+        The per-contract cut happens server-side; rows come back oldest first so
+        each bucket's eviction order matches what store() appends.
+        """
         if not self._turso_available:
             return
-        import base64 as b64module
         try:
-            result = self._turso_request([
-                "SELECT contract_id, question, answer, status, response_time, embedding_b64, category FROM answer_cache ORDER BY created_at DESC"
-            ])
+            result = self._turso_request([{
+                "sql": """WITH ranked AS (
+                    SELECT id, contract_id, question, answer, status, response_time, embedding_b64, category, embedding_blob, created_at,
+                           ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY created_at DESC) AS rn
+                    FROM answer_cache
+                )
+                SELECT contract_id, question, answer, status, response_time, embedding_b64, category, embedding_blob, id
+                FROM ranked WHERE rn <= ? ORDER BY created_at ASC""",
+                "args": [{"type": "integer", "value": str(self.MAX_ENTRIES)}]
+            }])
             if not result or 'results' not in result:
                 return
             # Parse response — results[0] is our SELECT
@@ -133,60 +333,70 @@ class SemanticCache:
             if select_result.get('type') != 'ok':
                 return
             rows = select_result['response']['result'].get('rows', [])
+            skipped = 0
             for row in rows:
                 contract_id = row[0]['value']
                 question = row[1]['value']
                 answer = row[2]['value']
                 status = row[3]['value'] if row[3]['type'] != 'null' else ''
                 response_time = float(row[4]['value']) if row[4]['type'] != 'null' else 0.0
-                emb_b64 = row[5]['value']
                 category = row[6]['value'] if row[6]['type'] != 'null' else ''
-                embedding = np.frombuffer(b64module.b64decode(emb_b64), dtype=np.float32)
+                # Prefer the BLOB column; rows written before it existed only have base64 text
+                if row[7]['type'] == 'blob':
+                    raw = _decode_b64(row[7]['base64'])
+                else:
+                    raw = _b64.b64decode(row[5]['value'])
+                embedding = _unpack_embedding(raw)
+                if embedding is None:
+                    skipped += 1
+                    continue
+                embedding = _normalize(embedding)
                 if contract_id not in self._entries:
-                    self._entries[contract_id] = []
+                    self._entries[contract_id] = _ContractBucket()
                 if len(self._entries[contract_id]) < self.MAX_ENTRIES:
-                    self._entries[contract_id].append((embedding, question, answer, status, response_time, category))
+                    entry_id = int(row[8]['value'])
+                    self._entries[contract_id].append((embedding, question, answer, status, response_time, category, entry_id))
+            if skipped:
+                print(f"[Cache] Skipped {skipped} zstd-compressed embeddings — zstandard not installed")
         except Exception as e:
             print(f"[Cache] Failed to load from Turso: {e}")
 
     def _save_to_turso(self, embedding, question, answer, status, response_time, contract_id, category):
-        """Persist a new cache entry to Turso via HTTP API."""
+        """Persist a new cache entry to Turso via HTTP API. Returns the new row id, or None."""
         if not self._turso_available:
-            return
-        import base64 as b64module
+            return None
         try:
-            emb_b64 = b64module.b64encode(np.array(embedding, dtype=np.float32).tobytes()).decode('ascii')
+            emb_b64 = _b64.b64encode(_pack_embedding(embedding)).decode('ascii')
             stmt = {
-                "sql": "INSERT INTO answer_cache (contract_id, question, answer, status, response_time, embedding_b64, category) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                "sql": "INSERT INTO answer_cache (contract_id, question, answer, status, response_time, embedding_b64, embedding_blob, category) VALUES (?, ?, ?, ?, ?, '', ?, ?)",
                 "args": [
                     {"type": "text", "value": contract_id},
                     {"type": "text", "value": question},
                     {"type": "text", "value": answer},
                     {"type": "text", "value": status or ""},
-                    {"type": "float", "value": response_time},
-                    {"type": "text", "value": emb_b64},
+                    {"type": "float", "value": float(response_time or 0.0)},
+                    {"type": "blob", "base64": emb_b64},
                     {"type": "text", "value": category or ""},
                 ]
             }
-            self._turso_request([stmt])
+            result = self._turso_request([stmt])
+            rowid = result['results'][0]['response']['result'].get('last_insert_rowid') if result else None
+            return int(rowid) if rowid is not None else None
         except Exception as e:
             print(f"[Cache] Failed to save to Turso: {e}")
+            return None
 
     def lookup(self, embedding, contract_id):
-        embedding = np.array(embedding, dtype=np.float32)
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        best_result = None
+        best_question = None
         with self._lock:
-            entries = self._entries.get(contract_id, [])
-            best_score = 0
-            best_result = None
-            best_question = None
-            for cached_emb, cached_q, cached_answer, cached_status, cached_time, cached_cat in entries:
-                score = np.dot(embedding, cached_emb) / (
-                    np.linalg.norm(embedding) * np.linalg.norm(cached_emb)
-                )
-                if score > self.SIMILARITY_THRESHOLD and score > best_score:
-                    best_score = score
-                    best_result = (cached_answer, cached_status, cached_time)
-                    best_question = cached_q
+            bucket = self._entries.get(contract_id)
+            match = bucket.best_match(embedding, self.SIMILARITY_THRESHOLD) if bucket else None
+            if match:
+                _, cached_q, cached_answer, cached_status, cached_time, _, _ = bucket.rows[match[1]]
+                best_result = (cached_answer, cached_status, cached_time)
+                best_question = cached_q
         # Increment serve_count in Turso (fire and forget)
         if best_result and best_question and self._turso_available:
             try:
@@ -203,21 +413,21 @@ class SemanticCache:
         return best_result
 
     def store(self, embedding, question, answer, status, response_time, contract_id, category=""):
-        embedding = np.array(embedding, dtype=np.float32)
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
         with self._lock:
             if contract_id not in self._entries:
-                self._entries[contract_id] = []
-            entries = self._entries[contract_id]
-            for cached_emb, _, _, _, _, _ in entries:
-                score = np.dot(embedding, cached_emb) / (
-                    np.linalg.norm(embedding) * np.linalg.norm(cached_emb)
-                )
-                if score > self.SIMILARITY_THRESHOLD:
-                    return
-            if len(entries) >= self.MAX_ENTRIES:
-                entries.pop(0)
-            entries.append((embedding, question, answer, status, response_time, category))
-        self._save_to_turso(embedding, question, answer, status, response_time, contract_id, category)
+                self._entries[contract_id] = _ContractBucket()
+            bucket = self._entries[contract_id]
+            if bucket.best_match(embedding, self.SIMILARITY_THRESHOLD):
+                return
+            if len(bucket) >= self.MAX_ENTRIES:
+                bucket.pop_oldest()
+            row = (_normalize(embedding), question, answer, status, response_time, category, None)
+            bucket.append(row)
+        entry_id = self._save_to_turso(embedding, question, answer, status, response_time, contract_id, category)
+        if entry_id is not None:
+            with self._lock:
+                bucket.set_id(row, entry_id)
 
     def clear(self, contract_id=None):
         with self._lock:
@@ -241,10 +451,9 @@ class SemanticCache:
     def clear_category(self, contract_id, category):
         """Clear only entries matching a specific category for a contract."""
         with self._lock:
-            entries = self._entries.get(contract_id, [])
+            bucket = self._entries.get(contract_id)
             # Keep entries that DON'T match the category
-            self._entries[contract_id] = [e for e in entries if e[5] != category]
-            removed = len(entries) - len(self._entries[contract_id])
+            removed = bucket.keep(lambda e: e[5] != category) if bucket else 0
         if self._turso_available:
             try:
                 stmt = {
@@ -263,18 +472,14 @@ class SemanticCache:
     def get_category_stats(self, contract_id=None):
         """Return dict of category -> count for a contract (or all contracts)."""
         with self._lock:
-            stats = {}
             if contract_id:
-                entries = self._entries.get(contract_id, [])
-                for _, _, _, _, _, cat in entries:
-                    label = cat if cat else "Uncategorized"
-                    stats[label] = stats.get(label, 0) + 1
+                bucket = self._entries.get(contract_id)
+                counts = bucket.categories if bucket else Counter()
             else:
-                for cid, entries in self._entries.items():
-                    for _, _, _, _, _, cat in entries:
-                        label = cat if cat else "Uncategorized"
-                        stats[label] = stats.get(label, 0) + 1
-            return stats
+                counts = Counter()
+                for bucket in self._entries.values():
+                    counts.update(bucket.categories)
+            return {label: n for label, n in counts.items() if n > 0}
 
     def stats(self):
         total = sum(len(v) for v in self._entries.values())
@@ -290,7 +495,7 @@ class SemanticCache:
         """
         if not self._turso_available:
             with self._lock:
-                entries = self._entries.get(contract_id, [])
+                entries = self._entries[contract_id].rows if contract_id in self._entries else []
                 return [
                     {'id': i, 'question': e[1], 'answer': e[2], 'status': e[3],
                      'category': e[5], 'created_at': 'unknown', 'thumbs_down': 0,
@@ -332,33 +537,20 @@ class SemanticCache:
         # Remove from Turso
         if self._turso_available:
             try:
-                # Get the question text first so we can remove from memory
-                stmt_select = {
-                    "sql": "SELECT question FROM answer_cache WHERE id = ?",
-                    "args": [{"type": "integer", "value": str(entry_id)}]
-                }
-                result = self._turso_request([stmt_select])
-                question_text = None
-                if result and 'results' in result:
-                    select_result = result['results'][0]
-                    if select_result.get('type') == 'ok':
-                        rows = select_result['response']['result'].get('rows', [])
-                        if rows:
-                            question_text = rows[0][0]['value']
-
                 stmt_delete = {
                     "sql": "DELETE FROM answer_cache WHERE id = ?",
                     "args": [{"type": "integer", "value": str(entry_id)}]
                 }
                 self._turso_request([stmt_delete])
 
-                # Remove from memory by matching question text
-                if question_text:
-                    with self._lock:
-                        entries = self._entries.get(contract_id, [])
-                        self._entries[contract_id] = [
-                            e for e in entries if e[1] != question_text
-                        ]
+                # Remove from memory by id — other entries may share the question text
+                entry_id = int(entry_id)
+                question_text = None
+                with self._lock:
+                    bucket = self._entries.get(contract_id)
+                    if bucket:
+                        question_text = next((e[1] for e in bucket.rows if e[6] == entry_id), None)
+                        bucket.keep(lambda e: e[6] != entry_id)
                 print(f"[Cache] Deleted entry {entry_id}: {question_text[:50] if question_text else 'unknown'}...")
                 return True
             except Exception as e:
@@ -366,20 +558,36 @@ class SemanticCache:
                 return False
         return False
 
-    def record_thumbs_down(self, question_text, contract_id):
+    def record_thumbs_down(self, question_text, contract_id, embedding=None):
         """Increment thumbs_down counter on the cached answer matching this question.
-        Called when a pilot clicks 👎. Uses fuzzy matching via embedding similarity
-        but for simplicity we match on exact question text first."""
+        Called when a pilot clicks 👎. When the question's embedding is given, the
+        cached entry is found by similarity (same threshold as lookup) and updated
+        by its Turso id; otherwise falls back to matching the exact question text."""
         if not self._turso_available:
             return False
+        entry_id = None
+        if embedding is not None:
+            embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+            with self._lock:
+                bucket = self._entries.get(contract_id)
+                match = bucket.best_match(embedding, self.SIMILARITY_THRESHOLD) if bucket else None
+                if match:
+                    row = bucket.rows[match[1]]
+                    question_text, entry_id = row[1], row[6]
         try:
-            stmt = {
-                "sql": "UPDATE answer_cache SET thumbs_down = thumbs_down + 1 WHERE contract_id = ? AND question = ?",
-                "args": [
-                    {"type": "text", "value": contract_id},
-                    {"type": "text", "value": question_text},
-                ]
-            }
+            if entry_id is not None:
+                stmt = {
+                    "sql": "UPDATE answer_cache SET thumbs_down = thumbs_down + 1 WHERE id = ?",
+                    "args": [{"type": "integer", "value": str(entry_id)}]
+                }
+            else:
+                stmt = {
+                    "sql": "UPDATE answer_cache SET thumbs_down = thumbs_down + 1 WHERE contract_id = ? AND question = ?",
+                    "args": [
+                        {"type": "text", "value": contract_id},
+                        {"type": "text", "value": question_text},
+                    ]
+                }
             result = self._turso_request([stmt])
             if result:
                 print(f"[Cache] Thumbs down recorded for: {question_text[:50]}...")
@@ -491,7 +699,70 @@ class SemanticCache:
             print(f"[Cache] Failed to set metadata '{key}': {e}")
 
 
+class RetrievalCache:
+    """In-memory cache of search_contract results for near-duplicate questions.
+
+    Sits below the answer cache: follow-ups and NOT_ADDRESSED questions are
+    never answer-cached but still re-run the same retrieval. A hit needs the
+    same signature — the chunk budget, matched packs, chain/force-include
+    keywords and BM25 query terms — so every input but the embedding ranking
+    is identical, plus a cosine match with a cached question embedding. Entries are kept per chunk list (checked by
+    identity) and dropped oldest-first. Not persisted — a restart re-warms it.
+    """
+    SIMILARITY_THRESHOLD = 0.93
+    MAX_ENTRIES = 256
+    MAX_CHUNK_LISTS = 4
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}  # id(chunks) -> [chunks, rows, matrix]; rows are (embedding, signature, merged)
+
+    def lookup(self, embedding, chunks, signature):
+        """Return a copy of the cached merged chunk list, or None."""
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        with self._lock:
+            bucket = self._buckets.get(id(chunks))
+            if bucket is None or bucket[0] is not chunks or not bucket[1]:
+                return None
+            rows = bucket[1]
+            if bucket[2] is None:
+                bucket[2] = np.vstack([r[0] for r in rows])
+            scores = bucket[2] @ embedding / (float(np.linalg.norm(embedding)) or 1.0)
+            for index in np.argsort(scores)[::-1]:
+                if scores[index] <= self.SIMILARITY_THRESHOLD:
+                    return None
+                if rows[index][1] == signature:
+                    return list(rows[index][2])
+        return None
+
+    def store(self, embedding, chunks, signature, merged):
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        with self._lock:
+            bucket = self._buckets.get(id(chunks))
+            if bucket is None or bucket[0] is not chunks:
+                bucket = [chunks, [], None]
+                self._buckets.pop(id(chunks), None)
+                self._buckets[id(chunks)] = bucket
+                while len(self._buckets) > self.MAX_CHUNK_LISTS:
+                    del self._buckets[next(iter(self._buckets))]
+            rows = bucket[1]
+            if len(rows) >= self.MAX_ENTRIES:
+                rows.pop(0)
+            rows.append((_normalize(embedding), signature, tuple(merged)))
+            bucket[2] = None
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
 @st.cache_resource
 def get_semantic_cache():
     """Shared cache instance — same object across all pages."""
     return SemanticCache()
+
+
+@st.cache_resource
+def get_retrieval_cache():
+    """Shared retrieval cache — same object across reruns and sessions."""
+    return RetrievalCache()
@@ -1,10 +1,175 @@
-import hashlib
+import atexit
+import csv
+import functools
+import io
 import json
 import os
+import queue
+import secrets
 import sqlite3
+import http.client
 import tempfile
-import urllib.request
+import threading
+import time
 from datetime import datetime
+from urllib.parse import urlsplit
+
+# orjson parses/serializes Turso payloads several times faster than json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# Streamlit Cloud (/mount/src) and Railway wipe local files on redeploy
+_IS_CLOUD = bool(os.path.exists("/mount/src") or os.environ.get("RAILWAY_ENVIRONMENT"))
+_TMP = tempfile.gettempdir()
+
+# Turso writes are queued and sent from a background thread in batches
+WRITE_QUEUE_SIZE = 1000
+DRAIN_BATCH_SIZE = 50
+DRAIN_BATCH_WAIT = 0.05  # max seconds a batch stays open after its first row
+PENDING_RETRY_INTERVAL = 60  # seconds between replays of failed Turso writes
+SHUTDOWN_FLUSH_TIMEOUT = 5  # seconds close() waits for queued writes at exit
+
+# Fail fast when Turso is slow or down: short timeouts, and after
+# TURSO_MAX_FAILURES consecutive failures skip Turso for TURSO_COOLDOWN seconds
+TURSO_READ_TIMEOUT = 2
+TURSO_WRITE_TIMEOUT = 5
+TURSO_MAX_FAILURES = 3
+TURSO_COOLDOWN = 30
+
+# Hrana stream reuse for the write path (see _turso_request close=False)
+TURSO_STREAM_MAX_REQUESTS = 100
+TURSO_STREAM_MAX_AGE = 30  # seconds
+TURSO_STREAM_IDLE = 5  # seconds; older batons may have been expired by the server
+
+# Constant SQL text so SQLite's statement cache and executemany grouping hit
+INSERT_QUESTIONS_SQL = """INSERT OR IGNORE INTO questions_log 
+    (question_id, user_hash, contract_id, timestamp, 
+     question_text, answer_text, status, category, response_time_seconds, cat_group)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+INSERT_RATINGS_SQL = """INSERT OR IGNORE INTO answer_ratings 
+    (rating_id, contract_id, timestamp, question_text, rating, comment)
+    VALUES (?, ?, ?, ?, ?, ?)"""
+
+TOP_QUESTIONS_SQL = "SELECT question_text, COUNT(*) as cnt FROM questions_log WHERE contract_id = ? GROUP BY question_text ORDER BY cnt DESC LIMIT ?"
+AMBIGUOUS_QUESTIONS_SQL = "SELECT question_text, COUNT(*) as cnt FROM questions_log WHERE contract_id = ? AND status = 'AMBIGUOUS' GROUP BY question_text ORDER BY cnt DESC LIMIT ?"
+RECENT_QUESTIONS_SQL = "SELECT timestamp, question_text, status, response_time_seconds FROM questions_log WHERE contract_id = ? ORDER BY timestamp DESC LIMIT ?"
+DASHBOARD_LIMIT = 100  # rows per list fetched by admin_dashboard
+
+# Errors from parsing an unexpected Turso response shape
+_RESULT_ERRORS = (KeyError, IndexError, TypeError, ValueError)
+
+# Admin "by category" grouping — sub-categories collapse to their parent
+# (e.g. "Pay → Duty Rig" becomes "Pay"). Stored as questions_log.cat_group
+# at insert time; CAT_GROUP_SQL is the same rule for backfilling old rows.
+CAT_GROUP_PREFIXES = (
+    ('Pay →', 'Pay'), ('Pay ', 'Pay'),
+    ('Reserve →', 'Reserve'), ('Reserve ', 'Reserve'),
+    ('Scheduling →', 'Scheduling'), ('Scheduling ', 'Scheduling'),
+    ('Grievance', 'Grievance'),
+    ('Hours of Service', 'Rest / Duty Limits'), ('Rest', 'Rest / Duty Limits'),
+    ('Training', 'Training'),
+)
+CAT_GROUP_SQL = """CASE 
+    WHEN category IS NULL OR category = '' THEN 'Uncategorized'
+    WHEN category LIKE 'Pay →%' OR category LIKE 'Pay %' THEN 'Pay'
+    WHEN category LIKE 'Reserve →%' OR category LIKE 'Reserve %' THEN 'Reserve'
+    WHEN category LIKE 'Scheduling →%' OR category LIKE 'Scheduling %' THEN 'Scheduling'
+    WHEN category LIKE 'Grievance%' THEN 'Grievance'
+    WHEN category LIKE 'Hours of Service%' OR category LIKE 'Rest%' THEN 'Rest / Duty Limits'
+    WHEN category LIKE 'Training%' THEN 'Training'
+    ELSE category
+END"""
+# SQLite's LIKE ignores ASCII case, so the Python side matches on lowercase too
+_CAT_GROUP_PREFIXES_LOWER = tuple((prefix.lower(), parent) for prefix, parent in CAT_GROUP_PREFIXES)
+_cat_group_cache = {}
+
+# Admin dashboards re-run the same reads on every rerun; serve them from
+# memory for a few seconds instead of going back to Turso each time.
+ADMIN_CACHE_TTL = 10  # seconds
+
+# Export format: bare header, then every text field quoted and the response
+# time left bare (what QUOTE_NONNUMERIC writes). Readers parse this layout.
+CSV_HEADER = "timestamp,question,status,response_time_seconds\n"
+
+# Hrana value type -> Python converter (text/blob pass through unchanged)
+_CONV = {
+    'null': lambda _v: None,
+    'integer': int,
+    'float': float,
+}
+
+
+def _identity(v):
+    return v
+
+
+def _parse_rows(rows):
+    """Convert raw Hrana rows into tuples of Python values."""
+    conv = _CONV.get
+    return [tuple(conv(col['type'], _identity)(col.get('value')) for col in row) for row in rows]
+
+
+def _pairs(rows):
+    """Raw Hrana rows of (key, COUNT(*)) -> [(key, int)] without the per-cell dispatch."""
+    return [(row[0].get('value'), int(row[1]['value'])) for row in rows]
+
+
+def _new_id(prefix):
+    """Row id and ISO timestamp from one clock read. The random suffix keeps
+    two rows logged at the same instant (e.g. from two threads) from colliding."""
+    # Wall clock, not monotonic_ns(): ids must stay ordered across restarts
+    # and processes, and the timestamp column is derived from the same read
+    now_ns = time.time_ns()
+    return f"{prefix}_{now_ns}_{secrets.token_hex(4)}", datetime.fromtimestamp(now_ns / 1e9).isoformat()
+
+
+def _arg(v):
+    """Python value -> Hrana statement argument (floats go as JSON numbers)."""
+    if v is None:
+        return {"type": "null"}
+    if isinstance(v, int):
+        return {"type": "integer", "value": str(v)}
+    if isinstance(v, float):
+        return {"type": "float", "value": v}
+    return {"type": "text", "value": str(v)}
+
+
+def category_group(category):
+    """Top-level admin group for a stored category (Python twin of CAT_GROUP_SQL)."""
+    group = _cat_group_cache.get(category)
+    if group is None:
+        group = 'Uncategorized' if not category else category
+        category_lower = category.lower() if category else ''
+        for prefix, parent in _CAT_GROUP_PREFIXES_LOWER:
+            if category_lower.startswith(prefix):
+                group = parent
+                break
+        _cat_group_cache[category] = group
+    return group
+
+
+def _ttl_cached(fn):
+    """Memoize a read method per (args, kwargs) for ADMIN_CACHE_TTL seconds."""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._admin_cache_lock:
+            hit = self._admin_cache.get(key)
+        if hit and now - hit[0] < ADMIN_CACHE_TTL:
+            return hit[1]
+        # The query itself runs outside the lock so slow reads don't serialize
+        value = fn(self, *args, **kwargs)
+        with self._admin_cache_lock:
+            self._admin_cache[key] = (now, value)
+        return value
+    return wrapper
 
 
 class ContractLogger:
@@ -22,77 +187,334 @@ class ContractLogger:
         self._turso_available = False
         self._http_url = ''
         self._turso_token = ''
+        self._write_q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._dropped_writes = 0
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._sqlite_lock = threading.Lock()
+        self._admin_cache = {}
+        self._admin_cache_lock = threading.Lock()
+        self._turso_fail_count = 0
+        self._turso_disabled_until = 0.0
+        self._turso_baton = None
+        self._turso_baton_used = 0.0
+        self._turso_stream_opened = 0.0
+        self._turso_stream_requests = 0
+        self._stream_sql_ids = {}
 
         # Try Turso first
         turso_url = os.environ.get('TURSO_DATABASE_URL', '')
         self._turso_token = os.environ.get('TURSO_AUTH_TOKEN', '')
         if turso_url and self._turso_token:
             self._http_url = turso_url.replace('libsql://', 'https://') + '/v3/pipeline'
+            parts = urlsplit(self._http_url)
+            self._http_scheme, self._http_host, self._http_path = parts.scheme, parts.netloc, parts.path
+            self._headers = {
+                'Content-Type': 'application/json',
+                'Authorization': f'Bearer {self._turso_token}',
+                'Connection': 'keep-alive',
+            }
             self._init_turso()
 
         # Local SQLite fallback (always available for dev/testing)
-        if os.path.exists("/mount/src") or os.environ.get("RAILWAY_ENVIRONMENT"):
-            self.db_path = os.path.join(tempfile.gettempdir(), "contract_qa.db")
+        self._is_ephemeral = _IS_CLOUD
+        if self._is_ephemeral:
+            self.db_path = os.path.join(_TMP, "contract_qa.db")
         else:
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
             self.db_path = db_path
         self._init_local_db()
 
+        # On ephemeral hosts the local file is wiped on redeploy, so when Turso
+        # is up it is the only write target. Failed Turso writes go to local
+        # SQLite and a pending file that the writer thread replays later.
+        self._turso_only = self._turso_available and self._is_ephemeral
+        self._pending_path = os.path.join(_TMP, "turso_pending.jsonl")
+        threading.Thread(target=self._drain, name="log-writer", daemon=True).start()
+        atexit.register(self.close)
+
     # ================================================================
     # TURSO HTTP API
     # ================================================================
-    def _turso_request(self, statements):
-        """Send SQL statements to Turso via HTTP API."""
+    def _turso_request(self, statements, timeout=TURSO_WRITE_TIMEOUT, close=True):
+        """Send SQL statements to Turso via HTTP API.
+
+        Reuses one keep-alive connection (guarded by a lock) so only the first
+        request pays for the TCP + TLS handshake; a dropped connection is
+        reopened and the request retried once. Returns None on failure, and
+        immediately while the circuit breaker is open.
+
+        close=False keeps the Hrana stream open and reuses it (via its baton)
+        on the next close=False call — used by the write path. The stream is
+        closed after TURSO_STREAM_MAX_REQUESTS requests or TURSO_STREAM_MAX_AGE
+        seconds, and abandoned if idle long enough that the server may have
+        expired it. On a reused stream each SQL text is sent once (store_sql)
+        and later statements refer to it by sql_id, like a prepared statement.
+        """
+        if time.monotonic() < self._turso_disabled_until:
+            return None
         requests_body = []
         for stmt in statements:
             if isinstance(stmt, str):
                 requests_body.append({"type": "execute", "stmt": {"sql": stmt}})
             elif isinstance(stmt, dict):
                 requests_body.append({"type": "execute", "stmt": stmt})
-        requests_body.append({"type": "close"})
-
-        data = json.dumps({"requests": requests_body}).encode('utf-8')
-        req = urllib.request.Request(
-            self._http_url,
-            data=data,
-            headers={
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self._turso_token}'
-            }
-        )
-        try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                return json.loads(resp.read().decode('utf-8'))
-        except urllib.request.HTTPError as e:
-            error_body = e.read().decode('utf-8') if e.fp else 'no body'
-            print(f"[Logger] Turso HTTP {e.code}: {error_body[:200]}")
-            return None
-        except Exception as e:
-            print(f"[Logger] Turso error: {e}")
-            return None
 
-    def _turso_query_rows(self, sql, args=None):
-        """Execute a single SELECT and return parsed rows. Returns list of tuples."""
+        with self._conn_lock:
+            baton = None
+            stream = not close
+            if stream:
+                now = time.monotonic()
+                if self._turso_baton and now - self._turso_baton_used < TURSO_STREAM_IDLE:
+                    baton = self._turso_baton
+                    if (self._turso_stream_requests >= TURSO_STREAM_MAX_REQUESTS
+                            or now - self._turso_stream_opened > TURSO_STREAM_MAX_AGE):
+                        close = True
+                else:
+                    self._turso_stream_opened = now
+                    self._turso_stream_requests = 0
+                # Re-set from the response; stays None if this request fails
+                self._turso_baton = None
+            for attempt in range(2):
+                body_requests = self._stream_requests(requests_body, baton) if stream else requests_body
+                payload = {"requests": body_requests + [{"type": "close"}] if close else body_requests}
+                if baton:
+                    payload["baton"] = baton
+                data = _json_dumps(payload)
+                try:
+                    if self._conn is None:
+                        conn_cls = http.client.HTTPSConnection if self._http_scheme == 'https' else http.client.HTTPConnection
+                        self._conn = conn_cls(self._http_host, timeout=timeout)
+                    elif self._conn.sock is not None:
+                        self._conn.sock.settimeout(timeout)
+                    self._conn.timeout = timeout
+                    self._conn.request("POST", self._http_path, body=data, headers=self._headers)
+                    resp = self._conn.getresponse()
+                    body = resp.read()
+                except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError) as e:
+                    self._close_conn()
+                    if attempt:
+                        return self._turso_failed(e)
+                    if baton:
+                        # Unknown whether the server ran the request, so the baton
+                        # and the sql_ids it stored can't be trusted — retry on a
+                        # fresh stream (the inserts are OR IGNORE, so a resend is safe)
+                        baton = None
+                        self._stream_sql_ids = {}
+                        self._turso_stream_opened = time.monotonic()
+                        self._turso_stream_requests = 0
+                    continue
+                except (OSError, http.client.HTTPException) as e:
+                    self._close_conn()
+                    return self._turso_failed(e)
+                if resp.status != 200:
+                    if baton and not attempt:
+                        # Stream expired server-side — retry once on a fresh stream
+                        baton = None
+                        self._turso_stream_opened = time.monotonic()
+                        self._turso_stream_requests = 0
+                        continue
+                    return self._turso_failed(f"HTTP {resp.status}: {body.decode('utf-8', 'replace')[:200]}")
+                try:
+                    result = _json_loads(body)
+                except ValueError as e:
+                    return self._turso_failed(e)
+                self._turso_fail_count = 0
+                # Only keep the stream if follow-ups can go to the same host
+                if not close and not result.get('base_url'):
+                    self._turso_baton = result.get('baton')
+                    self._turso_baton_used = time.monotonic()
+                    self._turso_stream_requests += 1
+                return result
+
+    def _stream_requests(self, requests_body, baton):
+        """Swap SQL text for stream-scoped sql_ids, storing each new SQL once.
+        A request without a baton opens a new stream, which starts with no ids."""
+        if not baton:
+            self._stream_sql_ids = {}
+        out = []
+        for req in requests_body:
+            stmt = req["stmt"]
+            sql = stmt.get("sql")
+            if sql is None:
+                out.append(req)
+                continue
+            sql_id = self._stream_sql_ids.get(sql)
+            if sql_id is None:
+                sql_id = self._stream_sql_ids[sql] = len(self._stream_sql_ids) + 1
+                out.append({"type": "store_sql", "sql_id": sql_id, "sql": sql})
+            stmt = {k: v for k, v in stmt.items() if k != "sql"}
+            stmt["sql_id"] = sql_id
+            out.append({"type": "execute", "stmt": stmt})
+        return out
+
+    def _turso_failed(self, error):
+        """Record a failed request; opens the circuit breaker after repeated failures."""
+        print(f"[Logger] Turso error: {error}")
+        self._turso_fail_count += 1
+        if self._turso_fail_count >= TURSO_MAX_FAILURES:
+            self._turso_disabled_until = time.monotonic() + TURSO_COOLDOWN
+            self._turso_fail_count = 0
+            print(f"[Logger] Turso failing — skipping it for {TURSO_COOLDOWN}s")
+        return None
+
+    def _close_conn(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _stmt(sql, args=None):
         stmt = {"sql": sql}
         if args:
             stmt["args"] = args
-        result = self._turso_request([stmt])
+        return stmt
+
+    def _turso_query_rows(self, sql, args=None):
+        """Execute a single SELECT and return parsed rows. Returns list of tuples."""
+        return _parse_rows(self._turso_raw_many([self._stmt(sql, args)])[0])
+
+    def _turso_query_col0(self, sql, args=None):
+        """Execute a single SELECT and return the first column's raw values as a list."""
+        return [row[0].get('value') for row in self._turso_raw_many([self._stmt(sql, args)])[0]]
+
+    def _turso_query_pairs(self, sql, args=None):
+        """Execute a single `SELECT key, COUNT(*) ...` and return (key, int) tuples."""
+        return _pairs(self._turso_raw_many([self._stmt(sql, args)])[0])
+
+    def _turso_raw_many(self, stmts):
+        """Execute several SELECTs in one pipeline request.
+        Returns the raw Hrana rows (lists of {'type', 'value'} cells) per statement,
+        [] where a statement failed."""
+        result = self._turso_request(stmts, timeout=TURSO_READ_TIMEOUT)
         if not result or 'results' not in result:
-            return []
-        select_result = result['results'][0]
-        if select_result.get('type') != 'ok':
-            return []
-        rows = select_result['response']['result'].get('rows', [])
-        parsed = []
-        for row in rows:
-            parsed.append(tuple(
-                None if col['type'] == 'null' else
-                int(col['value']) if col['type'] == 'integer' else
-                float(col['value']) if col['type'] == 'float' else
-                col['value']
-                for col in row
-            ))
-        return parsed
+            return [[] for _ in stmts]
+        return [
+            select_result['response']['result'].get('rows', []) if select_result.get('type') == 'ok' else []
+            for select_result in result['results'][:len(stmts)]
+        ]
+
+    def _enqueue_write(self, sql, params):
+        """Queue a write for the background thread. Never blocks the caller."""
+        try:
+            self._write_q.put_nowait((sql, params))
+        except queue.Full:
+            self._dropped_writes += 1
+            print(f"[Logger] Write queue full — dropped {self._dropped_writes} writes so far")
+
+    def _drain(self):
+        """Background worker: writes queued rows in batches — one Turso pipeline
+        and one SQLite transaction per batch. While idle, periodically replays
+        Turso writes that failed earlier."""
+        if self._turso_available:
+            self._replay_pending()
+        while True:
+            try:
+                batch = [self._write_q.get(timeout=PENDING_RETRY_INTERVAL)]
+            except queue.Empty:
+                if self._turso_available:
+                    self._replay_pending()
+                continue
+            # Coalesce for at most DRAIN_BATCH_WAIT after the first row, so a
+            # steady trickle of writes can't hold a batch open indefinitely
+            deadline = time.monotonic() + DRAIN_BATCH_WAIT
+            while len(batch) < DRAIN_BATCH_SIZE:
+                try:
+                    batch.append(self._write_q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"[Logger] Batch write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+
+    def _write_batch(self, batch):
+        """Send (sql, params) rows to Turso, and to local SQLite unless Turso-only.
+        Rows Turso rejects are kept locally and in the pending file."""
+        turso_ok = True
+        if self._turso_available:
+            stmts = [{"sql": sql, "args": [_arg(v) for v in params]} for sql, params in batch]
+            if self._turso_request(stmts, close=False) is None:
+                turso_ok = False
+                print(f"[Logger] Turso batch write failed — {len(batch)} rows queued for retry")
+                self._append_pending(stmts)
+        if self._turso_only and turso_ok:
+            return
+        # Group by statement so each INSERT runs as one executemany, all in one transaction
+        grouped = {}
+        for sql, params in batch:
+            grouped.setdefault(sql, []).append(params)
+        with self._sqlite_lock:
+            try:
+                self._sqlite.execute("BEGIN IMMEDIATE")
+                for sql, rows in grouped.items():
+                    self._sqlite.executemany(sql, rows)
+                self._sqlite.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._sqlite.in_transaction:
+                    self._sqlite.execute("ROLLBACK")
+                print(f"[Logger] Local SQLite write failed: {e}")
+
+    def _append_pending(self, stmts):
+        try:
+            with open(self._pending_path, 'ab') as f:
+                for stmt in stmts:
+                    f.write(_json_dumps(stmt) + b"\n")
+        except OSError as e:
+            print(f"[Logger] Could not save pending Turso writes: {e}")
+
+    def _replay_pending(self):
+        """Resend Turso writes saved by _write_batch. Anything still failing is kept for next time.
+
+        Every logger instance (chat page, admin page, API) shares the pending
+        file, so it is first renamed to a name only this call uses: another
+        instance then can't replay the same rows, and rows appended after the
+        rename land in a fresh file instead of being deleted with this one."""
+        claimed = f"{self._pending_path}.{os.getpid()}.{secrets.token_hex(4)}"
+        try:
+            os.replace(self._pending_path, claimed)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"[Logger] Could not claim pending Turso writes: {e}")
+            return
+        try:
+            with open(claimed, 'rb') as f:
+                stmts = [_json_loads(line) for line in f if line.strip()]
+            os.remove(claimed)
+        except (OSError, ValueError) as e:
+            print(f"[Logger] Could not read pending Turso writes: {e}")
+            return
+        for i in range(0, len(stmts), DRAIN_BATCH_SIZE):
+            if self._turso_request(stmts[i:i + DRAIN_BATCH_SIZE]) is None:
+                self._append_pending(stmts[i:])
+                return
+        if stmts:
+            print(f"[Logger] Replayed {len(stmts)} pending Turso writes")
+
+    def flush(self):
+        """Block until all queued writes have been written."""
+        self._write_q.join()
+
+    def close(self, timeout=SHUTDOWN_FLUSH_TIMEOUT):
+        """Give queued writes up to `timeout` seconds to land, then close the
+        SQLite and Turso connections. Registered with atexit, since the writer
+        is a daemon thread and would otherwise be killed mid-queue."""
+        deadline = time.monotonic() + timeout
+        with self._write_q.all_tasks_done:
+            while self._write_q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"[Logger] Shutting down with {self._write_q.unfinished_tasks} writes unflushed")
+                    break
+                self._write_q.all_tasks_done.wait(remaining)
+        with self._sqlite_lock:
+            self._sqlite.close()
+        with self._conn_lock:
+            self._close_conn()
 
     def _init_turso(self):
         """Create tables in Turso."""
@@ -119,7 +541,16 @@ class ContractLogger:
                     rating TEXT,
                     comment TEXT
                 )""",
-                "CREATE INDEX IF NOT EXISTS idx_ratings_contract ON answer_ratings(contract_id)"
+                "CREATE INDEX IF NOT EXISTS idx_ratings_contract ON answer_ratings(contract_id)",
+                # Precomputed category group (safe for existing databases)
+                "ALTER TABLE questions_log ADD COLUMN cat_group TEXT",
+                f"UPDATE questions_log SET cat_group = {CAT_GROUP_SQL} WHERE cat_group IS NULL",
+                "CREATE INDEX IF NOT EXISTS idx_questions_catgroup ON questions_log(contract_id, cat_group)",
+                # Admin filters on status / response time within a contract
+                "CREATE INDEX IF NOT EXISTS idx_qc_status ON questions_log(contract_id, status)",
+                "CREATE INDEX IF NOT EXISTS idx_qc_rt ON questions_log(contract_id, response_time_seconds)",
+                # Recent questions / CSV export: contract filter + timestamp order in one index
+                "CREATE INDEX IF NOT EXISTS idx_ql_contract_ts ON questions_log(contract_id, timestamp)",
             ])
             if result:
                 self._turso_available = True
@@ -133,9 +564,21 @@ class ContractLogger:
     # LOCAL SQLITE
     # ================================================================
     def _init_local_db(self):
-        """Create local SQLite tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Open the shared local SQLite connection and create tables.
+
+        One connection is reused for every read and write (serialized by
+        _sqlite_lock). WAL lets reads proceed alongside the writer and
+        busy_timeout waits out short locks instead of failing. Temp tables
+        (GROUP BY / ORDER BY sorts for the admin reads) stay in memory and the
+        page cache is raised to ~20 MB.
+        """
+        self._sqlite = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._sqlite.execute("PRAGMA journal_mode=WAL")
+        self._sqlite.execute("PRAGMA synchronous=NORMAL")
+        self._sqlite.execute("PRAGMA busy_timeout=5000")
+        self._sqlite.execute("PRAGMA temp_store=MEMORY")
+        self._sqlite.execute("PRAGMA cache_size=-20000")
+        cursor = self._sqlite.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS questions_log (
                 question_id TEXT PRIMARY KEY,
@@ -159,331 +602,242 @@ class ContractLogger:
                 comment TEXT
             )
         ''')
-        conn.commit()
-        conn.close()
+        try:
+            cursor.execute("ALTER TABLE questions_log ADD COLUMN cat_group TEXT")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        cursor.execute(f"UPDATE questions_log SET cat_group = {CAT_GROUP_SQL} WHERE cat_group IS NULL")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_catgroup ON questions_log(contract_id, cat_group)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_qc_status ON questions_log(contract_id, status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_qc_rt ON questions_log(contract_id, response_time_seconds)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ql_contract_ts ON questions_log(contract_id, timestamp)")
 
     def _local_query(self, sql, params=None):
         """Execute a SELECT against local SQLite. Returns list of tuples."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(sql, params or ())
-            rows = cursor.fetchall()
-            conn.close()
-            return rows
-        except:
+            with self._sqlite_lock:
+                return self._sqlite.execute(sql, params or ()).fetchall()
+        except sqlite3.Error as e:
+            print(f"[Logger] Local SQLite read failed: {e}")
             return []
 
     # ================================================================
     # WRITE METHODS
     # ================================================================
     def log_question(self, question_text, answer_text, status, contract_id, response_time=None, category=None):
-        """Log a question to both Turso and local SQLite."""
-        question_id = f"q_{datetime.now().timestamp()}"
-        user_hash = hashlib.sha256(str(datetime.now()).encode()).hexdigest()[:16]
-        timestamp = datetime.now().isoformat()
-
-        if self._turso_available:
-            try:
-                self._turso_request([{
-                    "sql": """INSERT OR IGNORE INTO questions_log 
-                              (question_id, user_hash, contract_id, timestamp, 
-                               question_text, answer_text, status, category, response_time_seconds)
-                              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    "args": [
-                        {"type": "text", "value": question_id},
-                        {"type": "text", "value": user_hash},
-                        {"type": "text", "value": contract_id},
-                        {"type": "text", "value": timestamp},
-                        {"type": "text", "value": question_text},
-                        {"type": "text", "value": answer_text},
-                        {"type": "text", "value": status or ""},
-                        {"type": "text", "value": category or "General Contract Question"},
-                        {"type": "float", "value": response_time or 0}
-                    ]
-                }])
-            except Exception as e:
-                print(f"[Logger] Turso write failed: {e}")
-
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO questions_log 
-                (question_id, user_hash, contract_id, timestamp, question_text, 
-                 answer_text, status, category, response_time_seconds)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (question_id, user_hash, contract_id, timestamp, question_text,
-                  answer_text, status, category or "General Contract Question", response_time))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[Logger] Local SQLite write failed: {e}")
+        """Queue a question for Turso and, unless Turso-only, local SQLite."""
+        question_id, timestamp = _new_id("q")
+        user_hash = secrets.token_hex(8)
+        category = category or "General Contract Question"
+        self._enqueue_write(
+            INSERT_QUESTIONS_SQL,
+            (question_id, user_hash, contract_id, timestamp, question_text, answer_text,
+             status or "", category, float(response_time or 0), category_group(category))
+        )
 
     def log_rating(self, question_text, rating, contract_id, comment=""):
-        """Log a rating to both Turso and local SQLite."""
-        rating_id = f"r_{datetime.now().timestamp()}"
-        timestamp = datetime.now().isoformat()
-
-        if self._turso_available:
-            try:
-                self._turso_request([{
-                    "sql": """INSERT OR IGNORE INTO answer_ratings 
-                              (rating_id, contract_id, timestamp, question_text, rating, comment)
-                              VALUES (?, ?, ?, ?, ?, ?)""",
-                    "args": [
-                        {"type": "text", "value": rating_id},
-                        {"type": "text", "value": contract_id},
-                        {"type": "text", "value": timestamp},
-                        {"type": "text", "value": question_text},
-                        {"type": "text", "value": rating},
-                        {"type": "text", "value": comment}
-                    ]
-                }])
-            except Exception as e:
-                print(f"[Logger] Turso rating write failed: {e}")
-
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO answer_ratings 
-                (rating_id, contract_id, timestamp, question_text, rating, comment)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (rating_id, contract_id, timestamp, question_text, rating, comment))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[Logger] Local rating write failed: {e}")
+        """Queue a rating for Turso and, unless Turso-only, local SQLite."""
+        rating_id, timestamp = _new_id("r")
+        self._enqueue_write(
+            INSERT_RATINGS_SQL,
+            (rating_id, contract_id, timestamp, question_text, rating, comment)
+        )
 
     # ================================================================
     # PUBLIC READ METHODS (always filter by contract_id)
     # ================================================================
+    @_ttl_cached
     def get_top_questions(self, limit=5, contract_id=None):
-        """Top questions by frequency for a specific contract."""
+        """Top questions by frequency for a specific contract.
+        Read from the DB (not per-process state) so every logger instance —
+        chat page, admin page, API — sees writes from the others."""
+        limit = int(limit)
         if contract_id:
-            sql = "SELECT question_text, COUNT(*) as cnt FROM questions_log WHERE contract_id = ? GROUP BY question_text ORDER BY cnt DESC LIMIT ?"
-            turso_args = [
-                {"type": "text", "value": contract_id},
-                {"type": "integer", "value": str(limit)}
-            ]
-            local_params = (contract_id, limit)
-        else:
-            sql = "SELECT question_text, COUNT(*) as cnt FROM questions_log GROUP BY question_text ORDER BY cnt DESC LIMIT ?"
-            turso_args = [{"type": "integer", "value": str(limit)}]
-            local_params = (limit,)
+            return self._select(TOP_QUESTIONS_SQL, (contract_id, limit), pairs=True)
+        return self._select(
+            "SELECT question_text, COUNT(*) as cnt FROM questions_log GROUP BY question_text ORDER BY cnt DESC LIMIT ?",
+            (limit,), pairs=True
+        )
 
+    # ================================================================
+    # ADMIN READ METHODS (all filter by contract_id)
+    # ================================================================
+    def _select(self, sql, params, pairs=False):
+        """Run one SELECT on Turso, falling back to local SQLite if it returns nothing."""
         if self._turso_available:
             try:
-                rows = self._turso_query_rows(sql, turso_args)
+                args = [_arg(p) for p in params]
+                rows = self._turso_query_pairs(sql, args) if pairs else self._turso_query_rows(sql, args)
                 if rows:
                     return rows
-            except:
-                pass
-        return self._local_query(sql, local_params)
-
-    # ================================================================
-    # ADMIN READ METHODS (all filter by contract_id)
-    # ================================================================
-    def admin_summary(self, contract_id):
-        """Overview stats for a contract: total, status counts, avg time."""
-        sql_total = "SELECT COUNT(*) FROM questions_log WHERE contract_id = ?"
-        sql_status = "SELECT status, COUNT(*) FROM questions_log WHERE contract_id = ? GROUP BY status"
-        sql_avg = "SELECT AVG(response_time_seconds) FROM questions_log WHERE contract_id = ? AND response_time_seconds > 0"
-        args = [{"type": "text", "value": contract_id}]
-        local_params = (contract_id,)
+            except _RESULT_ERRORS as e:
+                print(f"[Logger] Turso read failed: {e}")
+        return self._local_query(sql, params)
+
+    @_ttl_cached
+    def admin_dashboard(self, contract_id):
+        """Everything the admin page shows for a contract, in one Turso pipeline
+        request instead of one round trip per panel. Row lists are capped at
+        DASHBOARD_LIMIT; the admin_* wrappers below slice them. Every panel,
+        ratings and top questions included, comes from this one request so
+        the numbers agree with each other."""
+        # (key, sql, params, rows are (key, COUNT(*)) pairs)
+        queries = [
+            ('total', "SELECT COUNT(*) FROM questions_log WHERE contract_id = ?", (contract_id,), False),
+            ('status', "SELECT status, COUNT(*) FROM questions_log WHERE contract_id = ? GROUP BY status", (contract_id,), True),
+            ('avg', "SELECT AVG(response_time_seconds) FROM questions_log WHERE contract_id = ? AND response_time_seconds > 0", (contract_id,), False),
+            # One pass over the (contract_id, response_time_seconds) index for both counts
+            ('tier1', """SELECT COALESCE(SUM(CASE WHEN response_time_seconds = 0 THEN 1 ELSE 0 END), 0),
+                                COALESCE(SUM(CASE WHEN response_time_seconds > 0 THEN 1 ELSE 0 END), 0)
+                         FROM questions_log WHERE contract_id = ?""", (contract_id,), False),
+            ('down', "SELECT question_text, timestamp FROM answer_ratings WHERE contract_id = ? AND rating = 'down' ORDER BY timestamp DESC LIMIT 20", (contract_id,), False),
+            # cat_group is set at insert time (and backfilled for old rows), so
+            # this is an index-backed GROUP BY instead of a CASE over every row.
+            ('by_category', """SELECT COALESCE(cat_group, 'Uncategorized') as grp, COUNT(*) as cnt
+                               FROM questions_log 
+                               WHERE contract_id = ?
+                               GROUP BY grp
+                               ORDER BY cnt DESC""", (contract_id,), True),
+            ('ambiguous', AMBIGUOUS_QUESTIONS_SQL, (contract_id, DASHBOARD_LIMIT), True),
+            ('recent', RECENT_QUESTIONS_SQL, (contract_id, DASHBOARD_LIMIT), False),
+            ('rating_counts', "SELECT rating, COUNT(*) FROM answer_ratings WHERE contract_id = ? GROUP BY rating", (contract_id,), True),
+            ('top', TOP_QUESTIONS_SQL, (contract_id, DASHBOARD_LIMIT), True),
+        ]
 
+        results = None
         if self._turso_available:
             try:
-                total = self._turso_query_rows(sql_total, args)
-                statuses = self._turso_query_rows(sql_status, args)
-                avg_time = self._turso_query_rows(sql_avg, args)
-                return {
-                    'total': total[0][0] if total else 0,
-                    'status_counts': dict(statuses) if statuses else {},
-                    'avg_time': avg_time[0][0] if avg_time and avg_time[0][0] else 0,
-                }
-            except:
-                pass
-
-        total = self._local_query(sql_total, local_params)
-        statuses = self._local_query(sql_status, local_params)
-        avg_time = self._local_query(sql_avg, local_params)
+                raw = self._turso_raw_many([
+                    {"sql": sql, "args": [_arg(p) for p in params]} for _, sql, params, _ in queries
+                ])
+                # COUNT(*) always returns a row, so an empty 'total' means the request failed
+                if raw[0]:
+                    results = {
+                        key: _pairs(rows) if pairs else _parse_rows(rows)
+                        for (key, _, _, pairs), rows in zip(queries, raw)
+                    }
+            except _RESULT_ERRORS as e:
+                print(f"[Logger] Turso read failed: {e}")
+        if results is None:
+            results = {key: self._local_query(sql, params) for key, sql, params, _ in queries}
+
+        counts_dict = dict(results['rating_counts'])
+        up = counts_dict.get('up', 0)
+        down = counts_dict.get('down', 0)
+        rated = up + down
+        total, avg_time, tier1 = results['total'], results['avg'], results['tier1']
         return {
-            'total': total[0][0] if total else 0,
-            'status_counts': dict(statuses) if statuses else {},
-            'avg_time': avg_time[0][0] if avg_time and avg_time[0][0] else 0,
+            'summary': {
+                'total': total[0][0] if total else 0,
+                'status_counts': dict(results['status']),
+                'avg_time': avg_time[0][0] if avg_time and avg_time[0][0] else 0,
+            },
+            'tier1_vs_api': {
+                'tier1': tier1[0][0] if tier1 else 0,
+                'api': tier1[0][1] if tier1 else 0,
+            },
+            'ratings': {
+                'up': up, 'down': down, 'total': rated,
+                'satisfaction': round(up / rated * 100, 1) if rated > 0 else 0,
+                'down_questions': results['down'],
+            },
+            'top_questions': results['top'],
+            'by_category': results['by_category'],
+            'ambiguous': results['ambiguous'],
+            'recent': results['recent'],
         }
 
+    def admin_summary(self, contract_id):
+        """Overview stats for a contract: total, status counts, avg time."""
+        return self.admin_dashboard(contract_id)['summary']
+
     def admin_top_questions(self, contract_id, limit=20):
         """Top questions by frequency for admin view."""
-        return self.get_top_questions(limit=limit, contract_id=contract_id)
+        limit = int(limit)
+        if limit > DASHBOARD_LIMIT:
+            return self._select(TOP_QUESTIONS_SQL, (contract_id, limit), pairs=True)
+        return self.admin_dashboard(contract_id)['top_questions'][:limit]
 
     def admin_questions_by_category(self, contract_id):
         """Question counts grouped by stored category."""
-        # Use stored category column. Old rows without category show as 'Uncategorized'.
-        # Strip sub-categories (e.g. "Pay → Duty Rig" becomes "Pay")
-        sql = """SELECT 
-                    CASE 
-                        WHEN category IS NULL OR category = '' THEN 'Uncategorized'
-                        WHEN category LIKE 'Pay →%' OR category LIKE 'Pay %' THEN 'Pay'
-                        WHEN category LIKE 'Reserve →%' OR category LIKE 'Reserve %' THEN 'Reserve'
-                        WHEN category LIKE 'Scheduling →%' OR category LIKE 'Scheduling %' THEN 'Scheduling'
-                        WHEN category LIKE 'Grievance%' THEN 'Grievance'
-                        WHEN category LIKE 'Hours of Service%' OR category LIKE 'Rest%' THEN 'Rest / Duty Limits'
-                        WHEN category LIKE 'Training%' THEN 'Training'
-                        ELSE category
-                    END as cat_group,
-                    COUNT(*) as cnt
-                 FROM questions_log 
-                 WHERE contract_id = ?
-                 GROUP BY cat_group
-                 ORDER BY cnt DESC"""
-        args = [{"type": "text", "value": contract_id}]
-        local_params = (contract_id,)
-
-        if self._turso_available:
-            try:
-                rows = self._turso_query_rows(sql, args)
-                if rows:
-                    return rows
-            except:
-                pass
-        return self._local_query(sql, local_params)
+        return self.admin_dashboard(contract_id)['by_category']
 
     def admin_ambiguous_questions(self, contract_id, limit=20):
         """Questions that came back AMBIGUOUS — contract unclear."""
-        sql = "SELECT question_text, COUNT(*) as cnt FROM questions_log WHERE contract_id = ? AND status = 'AMBIGUOUS' GROUP BY question_text ORDER BY cnt DESC LIMIT ?"
-        args = [
-            {"type": "text", "value": contract_id},
-            {"type": "integer", "value": str(limit)}
-        ]
-        local_params = (contract_id, limit)
-
-        if self._turso_available:
-            try:
-                rows = self._turso_query_rows(sql, args)
-                if rows:
-                    return rows
-            except:
-                pass
-        return self._local_query(sql, local_params)
+        limit = int(limit)
+        if limit > DASHBOARD_LIMIT:
+            return self._select(AMBIGUOUS_QUESTIONS_SQL, (contract_id, limit), pairs=True)
+        return self.admin_dashboard(contract_id)['ambiguous'][:limit]
 
     def admin_ratings(self, contract_id):
         """Rating summary for a contract."""
-        sql_counts = "SELECT rating, COUNT(*) FROM answer_ratings WHERE contract_id = ? GROUP BY rating"
-        sql_down = "SELECT question_text, timestamp FROM answer_ratings WHERE contract_id = ? AND rating = 'down' ORDER BY timestamp DESC LIMIT 20"
-        args = [{"type": "text", "value": contract_id}]
-        local_params = (contract_id,)
-
-        if self._turso_available:
-            try:
-                counts = self._turso_query_rows(sql_counts, args)
-                down_qs = self._turso_query_rows(sql_down, args)
-                counts_dict = dict(counts) if counts else {}
-                up = counts_dict.get('up', 0)
-                down = counts_dict.get('down', 0)
-                total = up + down
-                return {
-                    'up': up, 'down': down, 'total': total,
-                    'satisfaction': round(up / total * 100, 1) if total > 0 else 0,
-                    'down_questions': down_qs,
-                }
-            except:
-                pass
-
-        counts = self._local_query(sql_counts, local_params)
-        down_qs = self._local_query(sql_down, local_params)
-        counts_dict = dict(counts) if counts else {}
-        up = counts_dict.get('up', 0)
-        down = counts_dict.get('down', 0)
-        total = up + down
-        return {
-            'up': up, 'down': down, 'total': total,
-            'satisfaction': round(up / total * 100, 1) if total > 0 else 0,
-            'down_questions': down_qs,
-        }
+        return self.admin_dashboard(contract_id)['ratings']
 
     def admin_recent_questions(self, contract_id, limit=50):
         """Recent questions log."""
-        sql = "SELECT timestamp, question_text, status, response_time_seconds FROM questions_log WHERE contract_id = ? ORDER BY timestamp DESC LIMIT ?"
-        args = [
-            {"type": "text", "value": contract_id},
-            {"type": "integer", "value": str(limit)}
-        ]
-        local_params = (contract_id, limit)
-
-        if self._turso_available:
-            try:
-                rows = self._turso_query_rows(sql, args)
-                if rows:
-                    return rows
-            except:
-                pass
-        return self._local_query(sql, local_params)
+        limit = int(limit)
+        if limit > DASHBOARD_LIMIT:
+            return self._select(RECENT_QUESTIONS_SQL, (contract_id, limit))
+        return self.admin_dashboard(contract_id)['recent'][:limit]
 
     def admin_tier1_vs_api(self, contract_id):
         """Count Tier 1 (0.0s response) vs API calls."""
-        sql_tier1 = "SELECT COUNT(*) FROM questions_log WHERE contract_id = ? AND response_time_seconds = 0"
-        sql_api = "SELECT COUNT(*) FROM questions_log WHERE contract_id = ? AND response_time_seconds > 0"
-        args = [{"type": "text", "value": contract_id}]
-        local_params = (contract_id,)
+        return self.admin_dashboard(contract_id)['tier1_vs_api']
 
-        if self._turso_available:
-            try:
-                t1 = self._turso_query_rows(sql_tier1, args)
-                api = self._turso_query_rows(sql_api, args)
-                return {
-                    'tier1': t1[0][0] if t1 else 0,
-                    'api': api[0][0] if api else 0,
-                }
-            except:
-                pass
-
-        t1 = self._local_query(sql_tier1, local_params)
-        api = self._local_query(sql_api, local_params)
-        return {
-            'tier1': t1[0][0] if t1 else 0,
-            'api': api[0][0] if api else 0,
-        }
-
-    def admin_export_csv(self, contract_id):
-        """Export all questions for a contract as CSV string."""
+    def admin_export_csv(self, contract_id, stream=False):
+        """Export all questions for a contract as CSV string.
+        With stream=True, returns a generator of CSV lines instead of one string."""
         sql = "SELECT timestamp, question_text, status, response_time_seconds FROM questions_log WHERE contract_id = ? ORDER BY timestamp DESC"
-        args = [{"type": "text", "value": contract_id}]
+        args = [_arg(contract_id)]
         local_params = (contract_id,)
+        to_csv = self._iter_csv if stream else self._rows_to_csv
 
         if self._turso_available:
             try:
                 rows = self._turso_query_rows(sql, args)
                 if rows:
-                    return self._rows_to_csv(rows)
-            except:
-                pass
+                    return to_csv(rows)
+            except _RESULT_ERRORS as e:
+                print(f"[Logger] Turso read failed: {e}")
         rows = self._local_query(sql, local_params)
-        return self._rows_to_csv(rows)
+        return to_csv(rows)
 
-    def _rows_to_csv(self, rows):
-        """Convert rows to CSV string."""
-        lines = ["timestamp,question,status,response_time_seconds"]
-        for row in rows:
-            ts = row[0] or ""
-            q = (row[1] or "").replace('"', '""')
-            status = row[2] or ""
-            rt = row[3] or 0
-            lines.append(f'"{ts}","{q}","{status}",{rt}')
-        return "\n".join(lines)
+    @staticmethod
+    def _csv_fields(rows):
+        return ((row[0] or "", row[1] or "", row[2] or "", row[3] or 0) for row in rows)
 
+    def _rows_to_csv(self, rows):
+        """Convert rows to CSV string (no trailing newline)."""
+        buf = io.StringIO()
+        buf.write(CSV_HEADER)
+        writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        writer.writerows(self._csv_fields(rows))
+        return buf.getvalue().rstrip("\n")
+
+    def _iter_csv(self, rows):
+        """Yield the CSV export one line at a time."""
+        buf = io.StringIO()
+        buf.write(CSV_HEADER)
+        writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        for fields in self._csv_fields(rows):
+            writer.writerow(fields)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    @_ttl_cached
     def admin_get_contracts(self):
         """Get list of all contract_ids that have logged questions."""
         sql = "SELECT DISTINCT contract_id FROM questions_log ORDER BY contract_id"
         if self._turso_available:
             try:
-                rows = self._turso_query_rows(sql)
-                if rows:
-                    return [r[0] for r in rows]
-            except:
-                pass
+                contracts = self._turso_query_col0(sql)
+                if contracts:
+                    return contracts
+            except _RESULT_ERRORS as e:
+                print(f"[Logger] Turso read failed: {e}")
         rows = self._local_query(sql)
         return [r[0] for r in rows]
 
@@ -509,6 +863,8 @@ if __name__ == "__main__":
     logger.log_rating("What is the daily pay guarantee?", "up", "NAC")
     print("✓ Rating logged")
 
+    logger.flush()
+
     top = logger.get_top_questions(5, contract_id="NAC")
     print(f"✓ Top questions: {top}")
 
@@ -1,47 +1,85 @@
 import pickle
-import json
 import os
+import threading
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
 
+# orjson parses metadata.json straight from bytes; stdlib json accepts bytes too
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Contracts whose chunks/embeddings stay in memory (least recently used evicted)
+LOADED_CONTRACTS_MAX = 2
+
 class ContractManager:
     """Manages multiple airline contracts"""
     
     def __init__(self, contracts_dir='contracts'):
         self.contracts_dir = contracts_dir
         self.contracts = {}
+        self._available = {}
+        self._loaded = OrderedDict()
+        self._loaded_lock = threading.Lock()
+        self._text_cache = {}
         self.load_all_contracts()
     
     def load_all_contracts(self):
         """Load metadata for all available contracts"""
-        contracts_path = Path(self.contracts_dir)
-        
-        if not contracts_path.exists():
+        loaded = []
+        try:
+            # DirEntry.is_dir() uses the cached dirent type (no stat), and a
+            # missing metadata.json is just a failed open
+            with os.scandir(self.contracts_dir) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    try:
+                        with open(os.path.join(entry.path, 'metadata.json'), 'rb') as f:
+                            metadata = _json_loads(f.read())
+                    except FileNotFoundError:
+                        continue
+                    self.contracts[metadata['contract_id']] = metadata
+                    loaded.append(f"  ✔ Loaded {metadata['airline_name']} ({metadata['contract_id']})")
+        except FileNotFoundError:
             print(f"Warning: {self.contracts_dir} directory not found")
             return
+        if loaded:
+            print("\n".join(loaded))
         
-        for contract_dir in contracts_path.iterdir():
-            if contract_dir.is_dir():
-                metadata_file = contract_dir / 'metadata.json'
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                        self.contracts[metadata['contract_id']] = metadata
-                        print(f"  ✔ Loaded {metadata['airline_name']} ({metadata['contract_id']})")
+        self._available = {k: v for k, v in self.contracts.items() if v.get('active', True)}
     
     def get_available_contracts(self):
-        """Get list of all available contracts"""
-        return {k: v for k, v in self.contracts.items() if v.get('active', True)}
+        """Get list of all available contracts (computed once in load_all_contracts)"""
+        return self._available
     
     def get_contract_info(self, contract_id):
         """Get metadata for specific contract"""
         return self.contracts.get(contract_id)
     
     def load_contract_data(self, contract_id):
-        """Load chunks and embeddings for a specific contract"""
+        """Load chunks and embeddings for a specific contract.
+        Recently used contracts are served from memory (LRU, LOADED_CONTRACTS_MAX)."""
         if contract_id not in self.contracts:
             raise ValueError(f"Contract {contract_id} not found")
         
+        with self._loaded_lock:
+            if contract_id in self._loaded:
+                self._loaded.move_to_end(contract_id)
+                return self._loaded[contract_id]
+        
+        data = self._read_contract_data(contract_id)
+        with self._loaded_lock:
+            self._loaded[contract_id] = data
+            self._loaded.move_to_end(contract_id)
+            while len(self._loaded) > LOADED_CONTRACTS_MAX:
+                self._loaded.popitem(last=False)
+        return data
+    
+    def _read_contract_data(self, contract_id):
+        """Read chunks and embeddings for a contract from disk"""
         contract_path = Path(self.contracts_dir) / contract_id
         
         # Load chunks
@@ -52,32 +90,47 @@ class ContractManager:
         with open(chunks_file, 'rb') as f:
             chunks = pickle.load(f)
         
-        # Load embeddings - prefer .npy (memory efficient), fallback to .pkl
+        # Whitespace-normalized lowercase text, used by force-include phrase matching
+        for chunk in chunks:
+            chunk['_text_lower'] = ' '.join(chunk['text'].lower().split())
+        
+        # Load embeddings - prefer .npy (memory-mapped), migrate .pkl once
         npy_file = contract_path / 'embeddings.npy'
         pkl_file = contract_path / 'embeddings.pkl'
         
         if npy_file.exists():
-            embeddings = np.load(str(npy_file), allow_pickle=False)
-            # Convert to list of arrays for compatibility
-            embeddings = [embeddings[i] for i in range(len(embeddings))]
+            # mmap: pages are read on first touch and shared with other processes;
+            # the (n, dim) array indexes and iterates like the old list of rows
+            embeddings = np.load(str(npy_file), mmap_mode='r', allow_pickle=False)
         elif pkl_file.exists():
             with open(pkl_file, 'rb') as f:
-                embeddings = pickle.load(f)
+                embeddings = np.asarray(pickle.load(f), dtype=np.float32)
+            try:
+                np.save(str(npy_file), embeddings)
+                print(f"  ✔ Migrated {contract_id} embeddings.pkl → embeddings.npy")
+            except OSError as e:
+                print(f"  Warning: could not write {npy_file}: {e}")
         else:
             raise FileNotFoundError(f"Embeddings file not found for {contract_id}")
         
         return chunks, embeddings
     
     def get_contract_text(self, contract_id):
-        """Load full contract text"""
-        contract_path = Path(self.contracts_dir) / contract_id
-        text_file = contract_path / 'contract_text.txt'
-        
-        if not text_file.exists():
+        """Load full contract text (decoded once, re-read only if the file changes)"""
+        text_file = os.path.join(self.contracts_dir, contract_id, 'contract_text.txt')
+        try:
+            mtime = os.stat(text_file).st_mtime_ns
+        except FileNotFoundError:
             return None
         
+        cached = self._text_cache.get(contract_id)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
         with open(text_file, 'r', encoding='utf-8') as f:
-            return f.read()
+            text = f.read()
+        self._text_cache[contract_id] = (mtime, text)
+        return text
 
 # Test the contract manager
 if __name__ == "__main__":
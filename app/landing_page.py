@@ -5,7 +5,6 @@ Maximum polish version. Every detail refined.
 """
 
 import streamlit as st
-from auth_manager import register_user, authenticate_user, init_auth_tables
 
 
 LANDING_CSS = """
@@ -27,6 +26,12 @@ LANDING_CSS = """
         padding-top: 2rem !important;
         padding-bottom: 2rem !important;
     }
+    /* Centered column: the keyed container and the wrapper Streamlit puts around it */
+    [data-testid="stVerticalBlockBorderWrapper"]:has(> .st-key-center_wrap),
+    .st-key-center_wrap {
+        max-width: 480px;
+        margin: 0 auto;
+    }
 
     /* ══════════════════════════════════════════
        CARD — elevated white card
@@ -238,47 +243,77 @@ LANDING_CSS = """
 """
 
 
-def show_landing_page():
-    if "auth_tables_initialized" not in st.session_state:
-        init_auth_tables()
-        st.session_state.auth_tables_initialized = True
+# Static landing HTML (flush-left so st.markdown never reads it as a code block)
+LANDING_HEADER_HTML = """
+<div style="text-align:center; margin-bottom:2rem;">
+    <div style="font-family:'Inter',sans-serif; font-size:0.92rem; font-weight:700;
+                letter-spacing:-0.02em; color:#2563EB; margin-bottom:1.5rem;">
+        AskTheContract
+    </div>
+    <div style="font-family:'Inter',sans-serif; font-size:1.65rem; font-weight:700;
+                color:#0F172A; letter-spacing:-0.03em; line-height:1.2; margin-bottom:0.6rem;">
+        Your contract, searchable<br>in seconds.
+    </div>
+    <div style="font-family:'Inter',sans-serif; font-size:0.88rem; color:#64748B;
+                line-height:1.55; font-weight:400;">
+        Exact language. Page numbers. Section references.<br>
+        Built by a line pilot, for line pilots.
+    </div>
+</div>
+"""
+
+TRUST_BADGE_HTML = """
+<div style="text-align:center; margin-bottom:0.5rem; margin-top:0.25rem;">
+    <div style="display:inline-flex; align-items:center; gap:0.35rem;
+                background:#F0FDF4; border:1px solid #BBF7D0;
+                border-radius:100px; padding:0.3rem 0.85rem;">
+        <span style="font-size:0.68rem;">🔒</span>
+        <span style="font-family:'Inter',sans-serif; font-size:0.71rem; font-weight:500;
+                    color:#166534; letter-spacing:0.01em;">
+            Your information is never sold or shared
+        </span>
+    </div>
+</div>
+"""
+
+LANDING_FOOTER_HTML = """
+<div style="margin-top:2rem; padding-top:1rem; border-top:1px solid #E2E8F0; text-align:center; padding-bottom:1rem;">
+    <span style="font-family:'Inter',sans-serif; font-size:0.7rem; color:#94A3B8;">
+        © 2026 AskTheContract · Independent pilot tool
+    </span>
+</div>
+"""
 
-    if "authenticated" not in st.session_state:
-        st.session_state.authenticated = False
-        st.session_state.user_id = None
-        st.session_state.user_email = None
-        st.session_state.display_name = None
+# Session keys the auth flow relies on, with their logged-out values
+_AUTH_STATE_DEFAULTS = (
+    ("authenticated", False),
+    ("user_id", None),
+    ("user_email", None),
+    ("display_name", None),
+)
+
+
+def show_landing_page():
+    for key, default in _AUTH_STATE_DEFAULTS:
+        st.session_state.setdefault(key, default)
 
     if st.session_state.authenticated:
         return True
 
-    st.markdown(LANDING_CSS, unsafe_allow_html=True)
-
-    # ── Centered layout ──
-    spacer_l, center, spacer_r = st.columns([1, 0.85, 1])
+    # Auth module + user tables are only needed once the login form is shown
+    if not st.session_state.setdefault("auth_tables_initialized", False):
+        from auth_manager import init_auth_tables
+        init_auth_tables()
+        st.session_state.auth_tables_initialized = True
 
-    with center:
+    # ── Centered layout (width set by .st-key-center_wrap in LANDING_CSS) ──
+    with st.container(key="center_wrap"):
 
         # ═══════════════════════════════════
         # GROUP 1: Brand + Headline
         # ═══════════════════════════════════
-        st.markdown("""
-        <div style="text-align:center; margin-bottom:2rem;">
-            <div style="font-family:'Inter',sans-serif; font-size:0.92rem; font-weight:700;
-                        letter-spacing:-0.02em; color:#2563EB; margin-bottom:1.5rem;">
-                AskTheContract
-            </div>
-            <div style="font-family:'Inter',sans-serif; font-size:1.65rem; font-weight:700;
-                        color:#0F172A; letter-spacing:-0.03em; line-height:1.2; margin-bottom:0.6rem;">
-                Your contract, searchable<br>in seconds.
-            </div>
-            <div style="font-family:'Inter',sans-serif; font-size:0.88rem; color:#64748B;
-                        line-height:1.55; font-weight:400;">
-                Exact language. Page numbers. Section references.<br>
-                Built by a line pilot, for line pilots.
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        # Styles ride along with the header: one markdown element instead of two
+        st.markdown(LANDING_CSS + LANDING_HEADER_HTML, unsafe_allow_html=True)
 
         # ═══════════════════════════════════
         # GROUP 2: Form Card
@@ -286,19 +321,7 @@ def show_landing_page():
         with st.container(border=True):
 
             # Trust badge inside the card
-            st.markdown("""
-            <div style="text-align:center; margin-bottom:0.5rem; margin-top:0.25rem;">
-                <div style="display:inline-flex; align-items:center; gap:0.35rem;
-                            background:#F0FDF4; border:1px solid #BBF7D0;
-                            border-radius:100px; padding:0.3rem 0.85rem;">
-                    <span style="font-size:0.68rem;">🔒</span>
-                    <span style="font-family:'Inter',sans-serif; font-size:0.71rem; font-weight:500;
-                                color:#166534; letter-spacing:0.01em;">
-                        Your information is never sold or shared
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(TRUST_BADGE_HTML, unsafe_allow_html=True)
 
             _show_auth_forms()
 
@@ -347,18 +370,14 @@ AskTheContract is an independent tool built by a fellow pilot. It is **not affil
             """)
 
         # Footer with separator
-        st.markdown("""
-        <div style="margin-top:2rem; padding-top:1rem; border-top:1px solid #E2E8F0; text-align:center; padding-bottom:1rem;">
-            <span style="font-family:'Inter',sans-serif; font-size:0.7rem; color:#94A3B8;">
-                © 2026 AskTheContract · Independent pilot tool
-            </span>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(LANDING_FOOTER_HTML, unsafe_allow_html=True)
 
     return False
 
 
 def _show_auth_forms():
+    from auth_manager import register_user, authenticate_user
+
     tab_login, tab_register = st.tabs(["Log in", "Create account"])
 
     with tab_login:
@@ -427,8 +446,6 @@ def show_logout_button():
     display = st.session_state.get("display_name", "Pilot")
     st.sidebar.markdown(f"**Logged in as:** {display}")
     if st.sidebar.button("Log Out", use_container_width=True):
-        st.session_state.authenticated = False
-        st.session_state.user_id = None
-        st.session_state.user_email = None
-        st.session_state.display_name = None
+        for key, default in _AUTH_STATE_DEFAULTS:
+            st.session_state[key] = default
         st.rerun()
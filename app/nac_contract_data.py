@@ -14,7 +14,15 @@ Everything in this file is NAC-specific. The main app (streamlit_app.py)
 contains only the universal logic that works for any airline.
 """
 
+import re
+import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
 
 # ============================================================
 # CONTRACT IDENTITY
@@ -40,16 +48,48 @@ PAY_RATES_DOS = {
 }
 
 # 2% annual increase computed dynamically — never goes stale
-def _compute_pay_increases():
-    """Count completed DOS anniversaries."""
-    now = datetime.now()
-    anniversaries = now.year - DOS_DATE.year
-    if (now.month, now.day) < (DOS_DATE.month, DOS_DATE.day):
+def _compute_pay_increases(day=None):
+    """Count completed DOS anniversaries as of `day` (default: today)."""
+    day = day or datetime.now().date()
+    anniversaries = day.year - DOS_DATE.year
+    if (day.month, day.day) < (DOS_DATE.month, DOS_DATE.day):
         anniversaries -= 1
     return max(0, anniversaries)
 
-PAY_INCREASES = _compute_pay_increases()
-PAY_MULTIPLIER = (1 + PAY_INCREASE_PERCENT) ** PAY_INCREASES
+# Same DOS rates as one float64 array [aircraft, position, year - 1]
+PAY_AIRCRAFT = tuple(PAY_RATES_DOS)
+PAY_POSITIONS = ('Captain', 'First Officer')
+PAY_YEARS = tuple(range(1, 13))
+PAY_TABLE_DOS = np.array(
+    [[[PAY_RATES_DOS[ac][pos][year] for year in PAY_YEARS] for pos in PAY_POSITIONS] for ac in PAY_AIRCRAFT],
+    dtype=np.float64,
+)
+
+@lru_cache(maxsize=8)
+def _pay_rates_for(day):
+    increases = _compute_pay_increases(day)
+    multiplier = (1 + PAY_INCREASE_PERCENT) ** increases
+    # One vectorized multiply; Python round() keeps the exact cents the
+    # per-rate round(rate * multiplier, 2) produced
+    table = np.array([round(v, 2) for v in (PAY_TABLE_DOS * multiplier).ravel().tolist()]).reshape(PAY_TABLE_DOS.shape)
+    rates = {
+        ac: {pos: dict(zip(PAY_YEARS, table[a, p].tolist())) for p, pos in enumerate(PAY_POSITIONS)}
+        for a, ac in enumerate(PAY_AIRCRAFT)
+    }
+    return increases, multiplier, rates
+
+def _as_day(as_of_date):
+    day = as_of_date or datetime.now().date()
+    return day.date() if isinstance(day, datetime) else day
+
+def get_pay_rates(as_of_date=None):
+    """(increases, multiplier, current rates) as of a date (default: today).
+    Computed once per date, so long-running processes pick up the July
+    increase without redoing the math on every question."""
+    return _pay_rates_for(_as_day(as_of_date))
+
+# Frozen at import: PAY_RATES_CURRENT[ac][pos][year] = round(DOS rate × PAY_MULTIPLIER, 2)
+PAY_INCREASES, PAY_MULTIPLIER, PAY_RATES_CURRENT = get_pay_rates()
 
 # ============================================================
 # PER DIEM
@@ -60,6 +100,15 @@ PER_DIEM_ANNUAL_INCREASE = 1    # Section 6.C.2.c — $1/day per anniversary
 PER_DIEM_KEYWORDS = ['per diem', 'per diem rate', 'what is per diem', 'how much is per diem',
                      'per diem amount', 'meal allowance', 'daily meal', 'per diem pay']
 
+def _drop_subsumed(keywords):
+    """Keywords minus any that contain another keyword — for substring `in`
+    tests the shorter one already matches everywhere the longer one does."""
+    return tuple(kw for kw in keywords if not any(other != kw and other in kw for other in keywords))
+
+# Same matches as PER_DIEM_KEYWORDS with 3 substring checks instead of 8.
+# (A compiled alternation regex measured slower than these `in` checks.)
+PER_DIEM_MATCH_TERMS = _drop_subsumed(PER_DIEM_KEYWORDS)
+
 # ============================================================
 # CONTEXT PACKS — Essential pages per topic
 # When a pilot asks about "pay", pull these pages.
@@ -153,8 +202,14 @@ CONTEXT_PACKS = {
     },
 }
 
-# Map question categories to context pack keys
-CATEGORY_TO_PACK = {
+# Page lists are only ever merged and membership-tested
+for _pack in CONTEXT_PACKS.values():
+    _pack['pages'] = frozenset(_pack['pages'])
+
+# Map question categories to context pack keys.
+# Keys are interned (as are the apps' QUESTION_CATEGORIES keys) so lookups
+# with a classifier label match on identity.
+CATEGORY_TO_PACK = {sys.intern(k): v for k, v in {
     'Pay → Hourly Rate': 'pay',
     'Pay → Daily Pay Guarantee': 'pay',
     'Pay → Duty Rig': 'pay',
@@ -182,7 +237,7 @@ CATEGORY_TO_PACK = {
     'Sick Leave': 'vacation',
     'Deadhead': 'pay',
     'Hours of Service': 'hours',
-}
+}.items()}
 
 
 # ============================================================
@@ -352,6 +407,11 @@ PROVISION_CHAINS = {
     'loa 15': [326, 328, 338, 339, 342, 344],
     'loa 16': [353, 354, 355, 356, 357, 358],
 }
+# Many keywords share a page list; equal sets share one object, so the
+# union below can skip repeats by identity
+_chain_page_sets = {}
+PROVISION_CHAINS = {k: _chain_page_sets.setdefault(frozenset(v), frozenset(v)) for k, v in PROVISION_CHAINS.items()}
+del _chain_page_sets
 
 # ============================================================
 # FORCE-INCLUDE RULES — Guaranteed chunk retrieval
@@ -521,16 +581,170 @@ FORCE_INCLUDE_RULES = {
     },
 }
 
-def find_force_include_chunks(question_lower, all_chunks):
-    forced = []
-    for rule_name, rule in FORCE_INCLUDE_RULES.items():
-        if any(kw in question_lower for kw in rule['trigger_keywords']):
-            for chunk in all_chunks:
-                chunk_text_lower = ' '.join(chunk['text'].lower().split())
-                for phrase in rule['must_include_phrases']:
-                    if phrase in chunk_text_lower:
-                        if chunk not in forced:
-                            forced.append(chunk)
+# ============================================================
+# KEYWORD MATCHING — provision chain keys + force-include triggers
+# One Aho-Corasick pass over the question finds every keyword when
+# pyahocorasick is installed; otherwise plain substring checks
+# (same matches, one `in` per keyword).
+# Matching is deliberately substring, not whole-token: stems such as
+# 'commut', 'reassign' and 'sick' are meant to hit 'commuting',
+# 'reassigned' and 'sickness'.
+# ============================================================
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+_MATCH_KEYWORDS = tuple(dict.fromkeys(
+    list(PROVISION_CHAINS) + [kw for rule in FORCE_INCLUDE_RULES.values() for kw in rule['trigger_keywords']]
+))
+
+if _ahocorasick is not None:
+    _KEYWORD_AUTOMATON = _ahocorasick.Automaton()
+    for _kw in _MATCH_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_kw, _kw)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+    def _matched_keywords(question_lower):
+        return {kw for _, kw in _KEYWORD_AUTOMATON.iter(question_lower)}
+else:
+    def _matched_keywords(question_lower):
+        return {kw for kw in _MATCH_KEYWORDS if kw in question_lower}
+
+
+def keyword_signature(question_lower):
+    """Every chain/force-include keyword in the question, as a hashable set.
+    Two questions with the same signature pull in the same keyword-driven pages.
+    Compute it once per question and pass it as `matched` to the helpers below."""
+    return frozenset(_matched_keywords(question_lower))
+
+
+def provision_chain_pages(question_lower, matched=None):
+    """Pages pulled in by PROVISION_CHAINS keywords found in the question.
+    Returns (frozenset of pages, matched chain keywords in PROVISION_CHAINS order)."""
+    if matched is None:
+        matched = _matched_keywords(question_lower)
+    hits = [keyword for keyword in PROVISION_CHAINS if keyword in matched]
+    return frozenset().union(*{id(PROVISION_CHAINS[k]): PROVISION_CHAINS[k] for k in hits}.values()), hits
+
+
+_FORCE_TRIGGERS = tuple(
+    (name, frozenset(rule['trigger_keywords'])) for name, rule in FORCE_INCLUDE_RULES.items()
+)
+
+
+def triggered_force_rules(question_lower, matched=None):
+    """Names of FORCE_INCLUDE_RULES whose trigger keywords appear in the question."""
+    if matched is None:
+        matched = _matched_keywords(question_lower)
+    return [name for name, triggers in _FORCE_TRIGGERS if not triggers.isdisjoint(matched)]
+
+
+# One alternation per rule: a single C-level search per chunk instead of
+# a Python `in` per phrase. Longest phrases first so overlaps still match.
+_FORCE_PHRASE_PATTERNS = {
+    name: re.compile('|'.join(
+        re.escape(p) for p in sorted(rule['must_include_phrases'], key=len, reverse=True)
+    ))
+    for name, rule in FORCE_INCLUDE_RULES.items()
+}
+
+
+# Postings: chunk indices matching each rule, built on first trigger and
+# kept per chunk list (one entry per loaded contract, oldest dropped).
+# Each entry also holds the chunk texts joined into one string plus the
+# start offset of each chunk, so building a rule's postings is a single
+# regex pass over contiguous text instead of one search per chunk, and a
+# uint16 column of chunk pages for page filtering.
+FORCE_POSTINGS_MAX = 4
+_CHUNK_SEPARATOR = '\x1f'  # never appears in a phrase, so matches can't span chunks
+FORCED_RESULTS_MAX = 1024
+_search_cache_lock = threading.Lock()  # sessions/requests search from several threads
+_force_postings = OrderedDict()  # id(all_chunks) -> (all_chunks, corpus, starts, {rule_name: (idx, ...)}, {rules: (idx, ...)}, pages)
+
+
+def _postings_entry(all_chunks):
+    with _search_cache_lock:
+        entry = _force_postings.get(id(all_chunks))
+        if entry is not None and entry[0] is all_chunks:
+            _force_postings.move_to_end(id(all_chunks))
+            return entry
+
+        texts = [chunk['_text_lower'] for chunk in all_chunks]
+        starts = np.zeros(len(texts), dtype=np.int64)
+        if texts:
+            np.cumsum([len(t) + 1 for t in texts[:-1]], out=starts[1:])
+        pages = np.fromiter((chunk['page'] for chunk in all_chunks), dtype=np.uint16, count=len(all_chunks))
+        entry = (all_chunks, _CHUNK_SEPARATOR.join(texts), starts, {}, {}, pages)
+        _force_postings[id(all_chunks)] = entry
+        while len(_force_postings) > FORCE_POSTINGS_MAX:
+            _force_postings.popitem(last=False)
+        return entry
+
+
+def _rule_postings(rule_name, all_chunks):
+    _, corpus, starts, postings_by_rule, _, _ = _postings_entry(all_chunks)
+    postings = postings_by_rule.get(rule_name)
+    if postings is None:
+        hits = [m.start() for m in _FORCE_PHRASE_PATTERNS[rule_name].finditer(corpus)]
+        postings = tuple(np.unique(np.searchsorted(starts, hits, side='right') - 1).tolist())
+        with _search_cache_lock:
+            postings = postings_by_rule.setdefault(rule_name, postings)
+    return postings
+
+
+def chunks_on_pages(all_chunks, pages):
+    """Chunks whose page is in pages, in corpus order."""
+    page_col = _postings_entry(all_chunks)[5]
+    if not pages or not len(page_col):
+        return []
+    wanted = np.zeros(int(page_col.max()) + 1, dtype=bool)
+    wanted[[p for p in pages if p < len(wanted)]] = True
+    return [all_chunks[i] for i in np.flatnonzero(wanted[page_col])]
+
+
+def find_force_include_chunks(question_lower, all_chunks, matched=None):
+    # The result depends only on which rules fire, so it is cached per rule set
+    rules = frozenset(triggered_force_rules(question_lower, matched))
+    if not rules:
+        return []
+    forced_by_rules = _postings_entry(all_chunks)[4]
+    indices = forced_by_rules.get(rules)
+    if indices is None:
+        forced = {}
+        for rule_name in FORCE_INCLUDE_RULES:
+            if rule_name in rules:
+                for i in _rule_postings(rule_name, all_chunks):
+                    forced.setdefault(all_chunks[i]['id'], i)
+        indices = tuple(forced.values())
+        with _search_cache_lock:
+            if len(forced_by_rules) >= FORCED_RESULTS_MAX:
+                del forced_by_rules[next(iter(forced_by_rules))]
+            forced_by_rules[rules] = indices
+    return [all_chunks[i] for i in indices]
+
+# ============================================================
+# EMBEDDING SIMILARITY
+# Row norms are computed once per embedding matrix (kept by identity,
+# like the postings above), so each query is a single pass over it.
+# ============================================================
+EMBEDDING_NORMS_MAX = 4
+_row_norms = OrderedDict()  # id(matrix) -> (matrix, row norms)
+
+
+def cosine_similarities(query, matrix):
+    """Cosine similarity of query against every row of matrix in one matmul."""
+    cached = _row_norms.get(id(matrix))
+    if cached is None or cached[0] is not matrix:
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        cached = (matrix, norms)
+        with _search_cache_lock:
+            _row_norms[id(matrix)] = cached
+            while len(_row_norms) > EMBEDDING_NORMS_MAX:
+                _row_norms.popitem(last=False)
+    query = np.asarray(query, dtype=np.float32)
+    return (matrix @ query) / (cached[1] * (np.linalg.norm(query) or 1.0))
 
 # ============================================================
 # DEFINITIONS — Contract terms for instant lookup
@@ -763,6 +977,77 @@ If you have been extended more than once in a month, this is a potential contrac
     },
 }
 
+# Read-only after import: keyword lists become tuples and both levels are
+# wrapped in MappingProxyType so nothing can mutate the shared table.
+TIER1_RULES = MappingProxyType({
+    key: MappingProxyType({**rule, 'keywords': tuple(rule['keywords'])})
+    for key, rule in TIER1_RULES.items()
+})
+
+# Rule order is priority: the first rule (in TIER1_RULES order) with a
+# keyword in the question wins. Same automaton/fallback split as the
+# chain keyword matcher above.
+_TIER1_ANSWERS = tuple(rule['answer'] for rule in TIER1_RULES.values())
+
+if _ahocorasick is not None:
+    _TIER1_AUTOMATON = _ahocorasick.Automaton()
+    for _rank, _rule in enumerate(TIER1_RULES.values()):
+        for _kw in _rule['keywords']:
+            # A keyword listed under two rules belongs to the earlier one
+            if _kw not in _TIER1_AUTOMATON:
+                _TIER1_AUTOMATON.add_word(_kw, _rank)
+    _TIER1_AUTOMATON.make_automaton()
+
+    def _tier1_rank(question_lower):
+        return min((rank for _, rank in _TIER1_AUTOMATON.iter(question_lower)), default=None)
+else:
+    # Flat parallel tuples in priority order: one tight loop of `in`
+    # checks measured faster than a compiled alternation per rule
+    _TIER1_KEYWORDS = tuple(sys.intern(kw) for rule in TIER1_RULES.values() for kw in rule['keywords'])
+    _TIER1_KEYWORD_RANKS = tuple(rank for rank, rule in enumerate(TIER1_RULES.values()) for _ in rule['keywords'])
+
+    def _tier1_rank(question_lower):
+        for kw, rank in zip(_TIER1_KEYWORDS, _TIER1_KEYWORD_RANKS):
+            if kw in question_lower:
+                return rank
+        return None
+
+
+# Rule questions that carry numeric duty/rest details are scenarios for the API
+TIER1_NUMERIC_SCENARIO_RE = re.compile(r'\d+(?:\.\d+)?\s*hours?\s*(?:of\s+)?(?:duty|rest|block|on duty)')
+
+
+@lru_cache(maxsize=4096)
+def _match_tier1_normalized(question_norm):
+    return _tier1_rank(question_norm)
+
+
+def _match_tier1_rank(question_lower):
+    # Case and runs of whitespace are folded first, so repeats of a question
+    # typed slightly differently share one cache entry
+    return _match_tier1_normalized(' '.join(question_lower.lower().split()))
+
+
+def match_tier1_answer(question_lower):
+    """Answer of the first matching TIER1_RULES entry, or None."""
+    rank = _match_tier1_rank(question_lower)
+    return None if rank is None else _TIER1_ANSWERS[rank]
+
+
+# Every matcher above folds only the question, never the keywords, so a
+# keyword with a capital letter would silently never match
+_not_lowercase = [
+    kw for kw in (
+        *_MATCH_KEYWORDS,
+        *(p for rule in FORCE_INCLUDE_RULES.values() for p in rule['must_include_phrases']),
+        *(kw for rule in TIER1_RULES.values() for kw in rule['keywords']),
+    )
+    if kw != kw.lower()
+]
+if _not_lowercase:
+    raise ValueError(f"Matcher keywords must be lowercase: {_not_lowercase}")
+del _not_lowercase
+
 # ============================================================
 # QUICK REFERENCE CARDS — Hand-written reference content
 # ============================================================
@@ -1310,6 +1595,11 @@ If you believe the contract has been violated, start saving evidence immediately
     },
 }
 
+# Read-only after import, same as TIER1_RULES
+QUICK_REFERENCE_CARDS = MappingProxyType({
+    name: MappingProxyType(card) for name, card in QUICK_REFERENCE_CARDS.items()
+})
+
 # ============================================================
 # CONTRACT CHAPTERS — Clickable section buttons on empty state
 # ============================================================
@@ -309,7 +309,7 @@ st.markdown("""
 # Keyword matching only, no AI, no embeddings
 # ============================================================
 
-QUESTION_CATEGORIES = {
+QUESTION_CATEGORIES = {sys.intern(k): v for k, v in {
     "Pay → Hourly Rate": ['hourly rate', 'pay rate', 'what do i make', 'how much do i make', 'rate of pay', 'longevity rate', 'current rate'],
     "Pay → Daily Pay Guarantee": ['dpg', 'daily pay guarantee', 'minimum pay per day', 'daily guarantee'],
     "Pay → Duty Rig": ['duty rig', 'duty day pay', '1:2'],
@@ -337,7 +337,7 @@ QUESTION_CATEGORIES = {
     "Sick Leave": ['sick', 'sick call', 'sick leave', 'calling in sick', 'illness', 'sick pay', 'sick bank'],
     "Deadhead": ['deadhead', 'deadhead pay', 'deadhead rest', 'positioning', 'repositioning'],
     "Hours of Service": ['hours of service', 'flight time limit', 'block limit', 'rest interruption', 'rest interrupted'],
-}
+}.items()}
 
 def classify_question(question_text):
     """Classify by keyword matching. No AI, no embeddings."""
@@ -382,7 +382,7 @@ def log_rating(question_text, rating, contract_id, comment=""):
 # ============================================================
 # SEMANTIC SIMILARITY CACHE — imported from cache_manager.py
 # ============================================================
-from cache_manager import SemanticCache, get_semantic_cache
+from cache_manager import SemanticCache, get_semantic_cache, get_retrieval_cache
 
 # ============================================================
 # INIT FUNCTIONS
@@ -443,8 +443,7 @@ def load_contract(contract_id):
     chunks, embeddings = manager.load_contract_data(contract_id)
     return chunks, embeddings
 
-def cosine_similarity(a, b):
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+# cosine_similarities → loaded from nac_contract_data.py
 
 # ============================================================
 # BM25 KEYWORD SEARCH
@@ -536,20 +535,7 @@ def get_embedding_cached(question_text, _openai_client):
 # FORCE-INCLUDE CHUNKS
 # ============================================================
 
-# FORCE_INCLUDE_RULES → loaded from nac_contract_data.py
-
-def find_force_include_chunks(question_lower, all_chunks):
-    forced = []
-    for rule_name, rule in FORCE_INCLUDE_RULES.items():
-        if any(kw in question_lower for kw in rule['trigger_keywords']):
-            for chunk in all_chunks:
-                chunk_text_lower = ' '.join(chunk['text'].lower().split())
-                for phrase in rule['must_include_phrases']:
-                    if phrase in chunk_text_lower:
-                        if chunk not in forced:
-                            forced.append(chunk)
-                        break
-    return forced
+# FORCE_INCLUDE_RULES, find_force_include_chunks → loaded from nac_contract_data.py
 
 # ============================================================
 # CONTEXT PACKS — Curated essential pages per topic
@@ -563,14 +549,13 @@ def find_force_include_chunks(question_lower, all_chunks):
 
 # Provision chains: keyword triggers → supplemental LOA/MOU pages
 # These fire regardless of pack category to catch cross-references
-# PROVISION_CHAINS → loaded from nac_contract_data.py
+# PROVISION_CHAINS, provision_chain_pages → loaded from nac_contract_data.py
 
 def get_pack_chunks(pack_key, all_chunks):
     """Get all chunks from a context pack's essential pages."""
     if pack_key not in CONTEXT_PACKS:
         return []
-    pages = set(CONTEXT_PACKS[pack_key]['pages'])
-    return [c for c in all_chunks if c['page'] in pages]
+    return chunks_on_pages(all_chunks, CONTEXT_PACKS[pack_key]['pages'])
 
 def classify_all_matching_packs(question_text):
     """Return all pack keys that match the question, ordered by match strength."""
@@ -591,25 +576,32 @@ def classify_all_matching_packs(question_text):
 def search_contract(question, chunks, embeddings, openai_client, max_chunks=75):
     question_embedding = get_embedding_cached(question, openai_client)
     question_lower = question.lower()
-    forced_chunks = find_force_include_chunks(question_lower, chunks)
+    matched_keywords = keyword_signature(question_lower)  # one keyword pass, shared below
+    forced_chunks = find_force_include_chunks(question_lower, chunks, matched_keywords)
 
     # Cross-topic pack detection — find ALL matching packs
-    matching_packs = classify_all_matching_packs(question)
+    matching_packs = classify_all_matching_packs(question_lower)
+
+    # Near-duplicate question with the same packs/keywords, BM25 query terms
+    # and chunk budget → same retrieval
+    retrieval_cache = get_retrieval_cache()
+    signature = (max_chunks, tuple(matching_packs), matched_keywords, tuple(sorted(_bm25_tokenize(question))))
+    cached = retrieval_cache.lookup(question_embedding, chunks, signature)
+    if cached is not None:
+        print(f"[Search] RETRIEVAL CACHE HIT: {len(cached)} chunks")
+        return cached
+
+    similarities = cosine_similarities(question_embedding, embeddings)
 
     if matching_packs:
         # Merge pages from all matching packs
-        merged_pages = set()
-        for pk in matching_packs:
-            merged_pages.update(CONTEXT_PACKS[pk]['pages'])
+        merged_pages = set().union(*(CONTEXT_PACKS[pk]['pages'] for pk in matching_packs))
 
         # Provision chain injection — add LOA/MOU pages triggered by keywords
-        chain_hits = []
-        for keyword, chain_pages in PROVISION_CHAINS.items():
-            if keyword in question_lower:
-                merged_pages.update(chain_pages)
-                chain_hits.append(keyword)
+        chain_pages, chain_hits = provision_chain_pages(question_lower, matched_keywords)
+        merged_pages.update(chain_pages)
 
-        pack_chunks = [c for c in chunks if c['page'] in merged_pages]
+        pack_chunks = chunks_on_pages(chunks, merged_pages)
         print(f"[Search] PACK MODE: {matching_packs} | chains: {chain_hits} | pages: {len(merged_pages)} | chunks: {len(pack_chunks)}")
 
         # Multi-pack gets slightly higher cap; single pack stays at 30
@@ -629,7 +621,7 @@ def search_contract(question, chunks, embeddings, openai_client, max_chunks=75):
             for pc in pack_chunks:
                 idx = id_to_idx.get(pc.get('id'))
                 if idx is not None:
-                    score = cosine_similarity(question_embedding, embeddings[idx])
+                    score = similarities[idx]
                 else:
                     score = 0
                 pack_scores.append((score, pc))
@@ -638,14 +630,9 @@ def search_contract(question, chunks, embeddings, openai_client, max_chunks=75):
     else:
         # FALLBACK MODE: pure embedding search (General questions)
         # But still check provision chains for keyword-triggered pages
-        chain_pages = set()
-        chain_hits = []
-        for keyword, pages in PROVISION_CHAINS.items():
-            if keyword in question_lower:
-                chain_pages.update(pages)
-                chain_hits.append(keyword)
+        chain_pages, chain_hits = provision_chain_pages(question_lower, matched_keywords)
         if chain_pages:
-            pack_chunks = [c for c in chunks if c['page'] in chain_pages]
+            pack_chunks = chunks_on_pages(chunks, chain_pages)
             print(f"[Search] FALLBACK + CHAINS: {chain_hits} | pages: {len(chain_pages)} | chunks: {len(pack_chunks)}")
         else:
             pack_chunks = []
@@ -653,13 +640,9 @@ def search_contract(question, chunks, embeddings, openai_client, max_chunks=75):
         embedding_top_n = 30
         max_total = 30
 
-    # Embedding search
-    similarities = []
-    for i, chunk_embedding in enumerate(embeddings):
-        score = cosine_similarity(question_embedding, chunk_embedding)
-        similarities.append((score, chunks[i]))
-    similarities.sort(reverse=True, key=lambda x: x[0])
-    embedding_chunks = [chunk for score, chunk in similarities[:embedding_top_n]]
+    # Embedding search — stable sort keeps chunk order on ties
+    top = np.argsort(-similarities, kind='stable')[:embedding_top_n]
+    embedding_chunks = [chunks[i] for i in top]
 
     # BM25 keyword search — catches exact terms embeddings miss
     bm25_top_n = min(10, embedding_top_n)
@@ -704,6 +687,7 @@ def search_contract(question, chunks, embeddings, openai_client, max_chunks=75):
     pages_sent = sorted(set(c['page'] for c in merged))
     print(f"[Search] FINAL: {len(merged)} chunks from pages {pages_sent[:15]}{'...' if len(pages_sent) > 15 else ''}")
 
+    retrieval_cache.store(question_embedding, chunks, signature, merged)
     return merged
 
 # ============================================================
@@ -794,7 +778,7 @@ def _build_pay_reference(question):
     for pos in positions:
         for y in years_to_show:
             dos = PAY_RATES_DOS['B737'][pos][y]
-            current = round(dos * PAY_MULTIPLIER, 2)
+            current = PAY_RATES_CURRENT['B737'][pos][y]
             lines.append(f"B737 {pos} Year {y}: DOS {dos:.2f} → Current {current:.2f}/hour")
 
     # If scenario has numbers, compute all pay guarantees
@@ -802,8 +786,7 @@ def _build_pay_reference(question):
         lines.append("")
         lines.append("PAY CALCULATIONS FOR THIS SCENARIO:")
         for pos in positions:
-            dos = PAY_RATES_DOS['B737'][pos][year]
-            rate = round(dos * PAY_MULTIPLIER, 2)
+            rate = PAY_RATES_CURRENT['B737'][pos][year]
             lines.append(f"  {pos} Year {year} rate: {rate:.2f}/hour")
 
             calcs = []
@@ -1243,21 +1226,23 @@ Do NOT use dollar signs ($) — write amounts without them (Streamlit renders $
                 "content": qa['answer']
             })
 
-    user_content = f"""CONTRACT SECTIONS:
+    # Assembled with one join — the context block is large, so each += would copy it
+    user_parts = [f"""CONTRACT SECTIONS:
 {context}
 
 QUESTION: {question}
-"""
+"""]
 
     # Inject pre-computed pay reference if applicable (already computed above for routing)
     if pay_ref:
-        user_content += f"\n{pay_ref}\n"
+        user_parts.append(f"\n{pay_ref}\n")
 
     # Inject grievance pattern alerts if applicable (already computed above for routing)
     if grievance_ref:
-        user_content += f"\n{grievance_ref}\n"
+        user_parts.append(f"\n{grievance_ref}\n")
 
-    user_content += "\nAnswer:"
+    user_parts.append("\nAnswer:")
+    user_content = ''.join(user_parts)
 
     messages.append({"role": "user", "content": user_content})
 
@@ -1326,13 +1311,8 @@ _check_pay_cache_freshness()
 # Per diem is computed dynamically based on current date
 def _get_per_diem_answer():
     """Build per diem Tier 1 answer with current rates based on anniversary increases."""
-    dos_date = datetime(2018, 7, 24)
-    now = datetime.now()
-    # Count anniversaries: each July 24 after DOS
-    anniversaries = now.year - dos_date.year
-    if (now.month, now.day) < (dos_date.month, dos_date.day):
-        anniversaries -= 1
-    anniversaries = max(0, anniversaries)
+    # Count anniversaries: each July 24 after DOS (cached per day)
+    anniversaries = get_pay_rates()[0]
 
     base_domestic = 56
     base_international = 72
@@ -1363,21 +1343,21 @@ Per Diem is calculated from the time of scheduled or actual report time at Domic
 
 # PER_DIEM_KEYWORDS → loaded from nac_contract_data.py
 
-def _match_tier1_rule(question_lower):
-    """Check if a question matches a Tier 1 fixed-value rule.
-    Returns the rule key or None."""
-    for rule_key, rule in TIER1_RULES.items():
-        if any(kw in question_lower for kw in rule['keywords']):
-            return rule_key
-    return None
+# match_tier1_answer → loaded from nac_contract_data.py
+
+# Tier 1 patterns, compiled once at import
+_YEAR_AFTER_RE = re.compile(r'year\s*(\d{1,2})')
+_YEAR_BEFORE_RE = re.compile(r'(\d{1,2})[\s-]*year')
+_YEAR_POSITION_RE = re.compile(r'year\s*\d{1,2}\s*(captain|capt|first officer|fo |f/o)|\d{1,2}[\s-]*year\s*(captain|capt|first officer|fo |f/o)')
+_TIME_REFERENCE_RE = re.compile(r'\d{1,2}\s*(?:am|pm|a\.m\.|p\.m\.)|noon|midnight|\d{4}\s*(?:ldt|local|zulu)')
 
 def _parse_pay_question(question_lower):
     """Parse a pay rate question and return (aircraft, position, year) or None."""
     # Extract year
-    year_match = re.search(r'year\s*(\d{1,2})', question_lower)
+    year_match = _YEAR_AFTER_RE.search(question_lower)
     if not year_match:
         # Try "12 year" or "12-year"
-        year_match = re.search(r'(\d{1,2})[\s-]*year', question_lower)
+        year_match = _YEAR_BEFORE_RE.search(question_lower)
     if not year_match:
         return None
     year = int(year_match.group(1))
@@ -1410,7 +1390,7 @@ def _format_pay_answer(aircraft, position, year):
 
     for ac, pos in combos:
         dos_rate = PAY_RATES_DOS[ac][pos][year]
-        current_rate = round(dos_rate * PAY_MULTIPLIER, 2)
+        current_rate = PAY_RATES_CURRENT[ac][pos][year]
         citation_parts.append(f'{pos} Year {year}: DOS rate {dos_rate:.2f}')
         rate_lines.append(f'- {pos} Year {year}: DOS rate {dos_rate:.2f} x 1.02^{PAY_INCREASES} ({PAY_MULTIPLIER:.5f}) = {current_rate:.2f} per hour')
 
@@ -1446,6 +1426,16 @@ def _format_definition_answer(term, definition):
 
     return answer
 
+# Definition questions: the captured term is looked up in DEFINITIONS_LOOKUP
+_DEF_PATTERNS = [
+    r'what (?:does|is|are|do)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:mean|stand for|definition)',
+    r'define\s+["\']?(.+?)["\']?\s*$',
+    r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:in the contract|per the contract|according to)',
+    r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*\??\s*$',
+]
+_DEF_COMPILED = [re.compile(p) for p in _DEF_PATTERNS]
+_DEF_TRAILING_RE = re.compile(r'\s+(mean|means|stand|stands|defined|definition).*$')
+
 def tier1_instant_answer(question_lower):
     """
     Check if a question can be answered instantly without API call.
@@ -1457,17 +1447,16 @@ def tier1_instant_answer(question_lower):
     # These are "what is the rule?" questions that match keywords also
     # found in scenarios, so they must be checked first.
     # Only triggers on clean rule-lookup phrasing, not scenario context.
-    rule_key = _match_tier1_rule(question_lower)
-    if rule_key:
+    answer = match_tier1_answer(question_lower)
+    if answer:
         # Extra guard: if the question contains specific numeric scenario details,
         # fall through to the API instead (e.g., "I had 8 hours rest after 16 hour duty")
-        has_numeric_scenario = re.search(r'\d+(?:\.\d+)?\s*hours?\s*(?:of\s+)?(?:duty|rest|block|on duty)', question_lower)
+        has_numeric_scenario = TIER1_NUMERIC_SCENARIO_RE.search(question_lower)
         if not has_numeric_scenario:
-            answer = TIER1_RULES[rule_key]['answer']
             return answer, 'CLEAR', round(time.time() - start, 1)
 
     # --- PER DIEM (computed dynamically based on current date) ---
-    if any(kw in question_lower for kw in PER_DIEM_KEYWORDS):
+    if any(kw in question_lower for kw in PER_DIEM_MATCH_TERMS):
         answer = _get_per_diem_answer()
         return answer, 'CLEAR', round(time.time() - start, 1)
 
@@ -1484,7 +1473,7 @@ def tier1_instant_answer(question_lower):
     has_scenario = any(s in question_lower for s in scenario_indicators)
     # Also catch time references: "3pm", "noon", "midnight", "0600", etc.
     if not has_scenario:
-        has_scenario = bool(re.search(r'\d{1,2}\s*(?:am|pm|a\.m\.|p\.m\.)|noon|midnight|\d{4}\s*(?:ldt|local|zulu)', question_lower))
+        has_scenario = bool(_TIME_REFERENCE_RE.search(question_lower))
     if has_scenario:
         return None
 
@@ -1502,8 +1491,7 @@ def tier1_instant_answer(question_lower):
             return answer, 'CLEAR', round(time.time() - start, 1)
 
     # Also catch "year X captain/FO" patterns even without explicit pay keywords
-    if re.search(r'year\s*\d{1,2}\s*(captain|capt|first officer|fo |f/o)', question_lower) or \
-       re.search(r'\d{1,2}[\s-]*year\s*(captain|capt|first officer|fo |f/o)', question_lower):
+    if _YEAR_POSITION_RE.search(question_lower):
         parsed = _parse_pay_question(question_lower)
         if parsed:
             aircraft, position, year = parsed
@@ -1511,19 +1499,13 @@ def tier1_instant_answer(question_lower):
             return answer, 'CLEAR', round(time.time() - start, 1)
 
     # --- DEFINITION QUESTIONS ---
-    def_patterns = [
-        r'what (?:does|is|are|do)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:mean|stand for|definition)',
-        r'define\s+["\']?(.+?)["\']?\s*$',
-        r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*(?:in the contract|per the contract|according to)',
-        r'what (?:is|are)\s+(?:a |an |the )?["\']?(.+?)["\']?\s*\??\s*$',
-    ]
-
-    for pattern in def_patterns:
-        match = re.search(pattern, question_lower.strip().rstrip('?'))
+    question_stripped = question_lower.strip().rstrip('?')
+    for pattern in _DEF_COMPILED:
+        match = pattern.search(question_stripped)
         if match:
             term = match.group(1).strip().lower()
             # Remove trailing words that aren't part of the term
-            term = re.sub(r'\s+(mean|means|stand|stands|defined|definition).*$', '', term)
+            term = _DEF_TRAILING_RE.sub('', term)
             if term in DEFINITIONS_LOOKUP:
                 answer = _format_definition_answer(term, DEFINITIONS_LOOKUP[term])
                 return answer, 'CLEAR', round(time.time() - start, 1)
@@ -2105,7 +2087,10 @@ else:
                     log_rating(qa['question'], "down", st.session_state.selected_contract)
                     try:
                         cache = get_semantic_cache()
-                        cache.record_thumbs_down(qa['question'], st.session_state.selected_contract)
+                        openai_client, _ = init_clients()
+                        # Same normalization as ask_question, so this hits the embedding cache
+                        question_embedding = get_embedding_cached(preprocess_question(qa['question'].strip()).lower(), openai_client)
+                        cache.record_thumbs_down(qa['question'], st.session_state.selected_contract, question_embedding)
                     except Exception:
                         pass
                     st.session_state.ratings[rating_key] = "down"
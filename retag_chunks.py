@@ -57,7 +57,7 @@ for chunk in chunks:
             changed += 1
 
 with open(CHUNKS_PATH, "wb") as f:
-    pickle.dump(chunks, f)
+    pickle.dump(chunks, f, protocol=5)
 
 print(f"Re-tagged {changed} chunks")
 print("Done!")